@@ -0,0 +1,97 @@
+import argparse
+import random
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+# Tohumlu (tekrarlanabilir) sentetik veri: users.txt, categories.txt, transactions.txt.
+# Aynı tohum ve parametreler her zaman aynı dosyaları üretir.
+# Kullanım: python -m benchmarks.generate [--dir data] [--users 10] [--categories 8] [--rows 100000] [--days 730]
+
+EXPENSE_NAMES = ["kira", "market", "faturalar", "ulaşım", "sağlık", "eğitim", "eğlence", "giyim", "restoran", "sigorta"]
+INCOME_NAMES = ["maaş", "ek gelir", "kira geliri", "faiz", "prim", "satış"]
+DESCRIPTIONS = ["", "", "haftalık alışveriş", "fatura ödemesi", "akşam yemeği", "taksi", "kira", "maaş", "hediye", "eczane"]
+
+
+def _id(rnd: random.Random) -> str:
+    return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+
+def _names(rnd: random.Random, pool: List[str], n: int) -> List[str]:
+    names = rnd.sample(pool, min(n, len(pool)))
+    names += [f"{pool[i % len(pool)]} {i // len(pool) + 1}" for i in range(len(names), n)]
+    return names
+
+
+def generate(
+    data_dir: Path = Path("data"),
+    users: int = 10,
+    categories: int = 8,
+    rows: int = 100_000,
+    days: int = 730,
+    seed: int = 1,
+    end: date | None = None,
+) -> List[Dict]:
+    # categories: kullanıcı başına kategori sayısı (yaklaşık 2/3 gider, 1/3 gelir).
+    # Tarihler end (varsayılan: bugün) dahil geriye doğru days gün içinde dağılır.
+    # Gider satırları gelire göre 4 kat sıktır; %10'u kategorisizdir.
+    if users < 1 or categories < 0 or rows < 0 or days < 1:
+        raise ValueError("Parametreler pozitif olmalı.")
+    rnd = random.Random(seed)
+    end = end or date.today()
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    people = [{"user_id": _id(rnd), "user_name": f"user{i}", "password": f"pass{i:04d}"} for i in range(users)]
+    cats: Dict[str, Dict[str, List[str]]] = {}
+    with (data_dir / "users.txt").open("w", encoding="utf-8", newline="") as f:
+        for p in people:
+            f.write(f"{p['user_id']}\t{p['user_name']}\t{p['password']}\n")
+    with (data_dir / "categories.txt").open("w", encoding="utf-8", newline="") as f:
+        for p in people:
+            n_income = categories // 3
+            by_type = {
+                "expense": _names(rnd, EXPENSE_NAMES, categories - n_income),
+                "income": _names(rnd, INCOME_NAMES, n_income),
+            }
+            cats[p["user_id"]] = {"expense": [], "income": []}
+            for t, names in by_type.items():
+                for name in names:
+                    cid = _id(rnd)
+                    cats[p["user_id"]][t].append(cid)
+                    f.write(f"{cid}\t{p['user_id']}\t{t}\t{name}\n")
+
+    # birkaç yoğun kullanıcı: ağırlıklar 1/(i+1)
+    weights = [1 / (i + 1) for i in range(users)]
+    uids = [p["user_id"] for p in people]
+    with (data_dir / "transactions.txt").open("w", encoding="utf-8", newline="") as f:
+        for uid in rnd.choices(uids, weights, k=rows):
+            t = "expense" if rnd.random() < 0.8 else "income"
+            choices = cats[uid][t]
+            cid = rnd.choice(choices) if choices and rnd.random() < 0.9 else ""
+            d = (end - timedelta(days=rnd.randrange(days))).strftime("%d-%m-%Y")
+            cents = rnd.randint(500, 500_000) if t == "expense" else rnd.randint(50_000, 5_000_000)
+            desc = rnd.choice(DESCRIPTIONS)
+            f.write(f"{_id(rnd)}\t{uid}\t{d}\t{t}\t{cents // 100}.{cents % 100:02d}\t{cid}\t{desc}\n")
+    return people
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.generate")
+    p.add_argument("--dir", default="data", help="hedef klasör (dosyaların üzerine yazılır)")
+    p.add_argument("--users", type=int, default=10)
+    p.add_argument("--categories", type=int, default=8, help="kullanıcı başına")
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--days", type=int, default=730, help="tarih aralığı (bugünden geriye)")
+    p.add_argument("--seed", type=int, default=1)
+    a = p.parse_args(argv)
+    try:
+        people = generate(Path(a.dir), a.users, a.categories, a.rows, a.days, a.seed)
+    except ValueError as e:
+        p.exit(1, f"{e}\n")
+    print(f"{len(people)} kullanıcı, {a.rows} işlem -> {a.dir}")
+
+
+if __name__ == "__main__":
+    main()
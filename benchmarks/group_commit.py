@@ -0,0 +1,50 @@
+import argparse
+import os
+import tempfile
+import time
+
+from src.core import config
+from src.services import auth_service, category_service, transaction_service
+from src.storage import file_cache, txt_store
+
+# Tek satır ve toplu yazma modlarının ekleme hızı (boş, geçici bir data/ klasöründe).
+# Kullanım: python -m benchmarks.group_commit [-n 2000]
+
+MODES = [("row", False), ("row", True), ("group", False), ("group", True)]
+
+
+def run(commit: str, fsync: bool, n: int) -> float:
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as d:
+        os.chdir(d)
+        try:
+            file_cache.clear()
+            txt_store.WRITE_FSYNC = fsync
+            config.ensure_data_files_exist()
+            user = auth_service.register("benchuser", "benchpw", "benchpw")
+            cat = category_service.create_category(user["user_id"], "market", "expense")
+            start = time.perf_counter()
+            for i in range(n):
+                transaction_service.create_transaction(
+                    user["user_id"], "expense", "12.50", "01-01-2025", cat["category_id"], f"satır {i}", commit=commit
+                )
+            txt_store.flush()
+            elapsed = time.perf_counter() - start
+            assert len(transaction_service.list_transactions(user["user_id"])) == n
+        finally:
+            os.chdir(cwd)
+            file_cache.clear()
+    return n / elapsed
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.group_commit")
+    p.add_argument("-n", type=int, default=2000, help="eklenecek satır sayısı")
+    a = p.parse_args(argv)
+    print(f"{'mod':<8}{'fsync':<8}{'satır/sn':>12}")
+    for commit, fsync in MODES:
+        print(f"{commit:<8}{str(fsync):<8}{run(commit, fsync, a.n):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from src.core import config
+from src.services import transaction_service
+from src.storage import chunks
+from benchmarks.generate import generate
+
+# transactions.txt soğuk yüklemesi: seri ayrıştırma ile farklı süreç sayılarında paralel
+# ayrıştırmanın süresi; her paralel sonucun seriyle aynı olduğu da doğrulanır.
+# Kullanım: python -m benchmarks.parallel_parse [--rows 1000000] [--workers 2,4,8] [--chunk-mb 16]
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.parallel_parse")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--users", type=int, default=20)
+    p.add_argument("--workers", default=f"2,{os.cpu_count() or 1}", help="virgülle ayrılmış süreç sayıları")
+    p.add_argument("--chunk-mb", type=float, default=16)
+    p.add_argument("--seed", type=int, default=1)
+    a = p.parse_args(argv)
+
+    cwd = os.getcwd()
+    results = []
+    with tempfile.TemporaryDirectory() as d:
+        os.chdir(d)
+        try:
+            generate(config.DATA_DIR, a.users, 8, a.rows, 730, a.seed)
+            path = config.TRANSACTIONS_FILE
+
+            start = time.perf_counter()
+            serial = transaction_service._group_by_user(transaction_service._items(path))
+            base = time.perf_counter() - start
+            results.append({"workers": 1, "seconds": round(base, 3), "speedup": 1.0})
+
+            chunks.PARSE_CHUNK_BYTES = int(a.chunk_mb * 1024 * 1024)
+            for n in sorted({int(w) for w in a.workers.split(",") if w.strip()}):
+                if n < 2:
+                    continue
+                chunks.PARSE_WORKERS = n
+                start = time.perf_counter()
+                parallel = transaction_service._parse_parallel(path)
+                elapsed = time.perf_counter() - start
+                if parallel != serial:
+                    p.exit(1, f"{n} süreç: sonuç seri ayrıştırmadan farklı.\n")
+                del parallel
+                results.append({"workers": n, "seconds": round(elapsed, 3), "speedup": round(base / elapsed, 2)})
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "rows": a.rows,
+        "cpu_count": os.cpu_count(),
+        "chunk_mb": a.chunk_mb,
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.core import config
+from src.core.config import TRANSACTIONS_FILE
+from src.services import report_service, transaction_service
+from src.storage import backend, bin_store, file_cache, shards, sqlite_store
+from benchmarks.generate import generate
+
+# Servis fonksiyonlarının veri boyutuna göre ölçeklenmesi. Her boyut için geçici bir
+# klasörde tohumlu veri üretilir ve geçerli yapılandırma (config) ile ölçülür.
+# Her işlem için:
+#   cold_s      önbellek boşken ilk çağrı (saniye)
+#   ops_per_sec önbellek ısınmışken tekrarlanan çağrılar
+#   peak_kib    soğuk çağrı sırasında en yüksek Python bellek kullanımı (tracemalloc)
+# Çıktı JSON'dur; farklı commit'lerin sonuçları karşılaştırılabilir.
+# Kullanım: python -m benchmarks.suite [--sizes 1000,10000,100000] [--repeat 5] [-o sonuc.json]
+
+
+def _ops(uid: str) -> Dict[str, Callable[[int], object]]:
+    return {
+        "read_rows": lambda i: backend.read_rows(TRANSACTIONS_FILE),
+        "list_transactions": lambda i: transaction_service.list_transactions(uid),
+        "by_category": lambda i: report_service.by_category(uid, "expense"),
+        "last_12_months_table": lambda i: report_service.last_12_months_table(uid),
+        "update_transaction_by_index": lambda i: transaction_service.update_transaction_by_index(
+            uid, "expense", 1, "description", f"bench {i}"
+        ),
+    }
+
+
+def _prepare() -> None:
+    # Üretilen TSV'yi yapılandırılmış depoya taşır.
+    if backend.indexed(TRANSACTIONS_FILE):
+        sqlite_store.migrate_from_txt()
+    elif backend.is_binary(TRANSACTIONS_FILE):
+        bin_store.import_tsv()
+    elif transaction_service.sharded():
+        shards.migrate_to_shards()
+
+
+def _measure(op: Callable[[int], object], repeat: int) -> Dict[str, float]:
+    file_cache.clear()
+    tracemalloc.start()
+    op(0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    file_cache.clear()
+    start = time.perf_counter()
+    op(1)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(repeat):
+        op(i + 2)
+    warm = time.perf_counter() - start
+    return {
+        "cold_s": round(cold, 6),
+        "ops_per_sec": round(repeat / warm, 2) if warm else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_size(rows: int, users: int, categories: int, days: int, seed: int, repeat: int) -> List[Dict]:
+    cwd = os.getcwd()
+    results = []
+    with tempfile.TemporaryDirectory() as d:
+        os.chdir(d)
+        try:
+            people = generate(config.DATA_DIR, users, categories, rows, days, seed)
+            _prepare()
+            uid = people[0]["user_id"]  # en yoğun kullanıcı
+            for name, op in _ops(uid).items():
+                results.append({"rows": rows, "op": name, **_measure(op, repeat)})
+        finally:
+            os.chdir(cwd)
+            file_cache.clear()
+    return results
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def main(argv: list[str] | None = None) -> None:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    p.add_argument("--sizes", default="1000,10000,100000", help="virgülle ayrılmış işlem sayıları")
+    p.add_argument("--users", type=int, default=10)
+    p.add_argument("--categories", type=int, default=8, help="kullanıcı başına")
+    p.add_argument("--days", type=int, default=730)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--repeat", type=int, default=5, help="ısınmış ölçüm için tekrar sayısı")
+    p.add_argument("-o", "--output", help="JSON dosyası (varsayılan: standart çıktı)")
+    a = p.parse_args(argv)
+    try:
+        sizes = [int(s) for s in a.sizes.split(",") if s.strip()]
+    except ValueError:
+        p.exit(2, "--sizes sayı listesi olmalı.\n")
+
+    report = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "config": {
+            "storage_backend": config.STORAGE_BACKEND,
+            "transactions_layout": config.TRANSACTIONS_LAYOUT,
+            "transaction_cache": config.TRANSACTION_CACHE,
+            "report_backend": config.REPORT_BACKEND,
+        },
+        "params": {"users": a.users, "categories": a.categories, "days": a.days, "seed": a.seed, "repeat": a.repeat},
+        "results": [],
+    }
+    for n in sizes:
+        print(f"{n} satır...", file=sys.stderr)
+        report["results"] += run_size(n, a.users, a.categories, a.days, a.seed, a.repeat)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if a.output:
+        Path(a.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
-from src.core.config import ensure_data_files_exist
+from src.core import instrument
+from src.core.config import ensure_data_files_exist, CATEGORIES_FILE, TRANSACTIONS_FILE
+from src.services.transaction_service import sharded
+from src.storage import shards
+from src.storage.backend import compact
 from src.ui.menu import welcome_loop, app_menu
 
 def main():
+    instrument.setup()
     ensure_data_files_exist()
 
     user = welcome_loop()
@@ -10,6 +15,12 @@ def main():
         return
 
     app_menu(user)
+    # kullanıcı dosyalarının günlükleri de katlanır (günlüğü olmayan dosyaya dokunulmaz)
+    paths = [CATEGORIES_FILE, TRANSACTIONS_FILE]
+    if sharded():
+        paths += shards.shard_paths()
+    for p in paths:
+        compact(p)
 
     print("\nGörüşmek üzere.")
 
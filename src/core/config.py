@@ -4,6 +4,67 @@ DATA_DIR = Path("data")
 USERS_FILE = DATA_DIR / "users.txt"
 CATEGORIES_FILE = DATA_DIR / "categories.txt"
 TRANSACTIONS_FILE = DATA_DIR / "transactions.txt"
+TRANSACTIONS_DIR = DATA_DIR / "transactions"
+AGGREGATES_FILE = DATA_DIR / "aggregates.txt"
+AGGREGATES_LOG_FILE = DATA_DIR / "aggregates.log"
+SQLITE_FILE = DATA_DIR / "expense.db"
+USERS_INDEX_FILE = DATA_DIR / "users_index.txt"
+
+# "tsv" (data/*.txt), "sqlite" (SQLITE_FILE; aktarım: python -m src.storage.sqlite_store migrate)
+# ya da "binary" (transactions.bin/.heap; aktarım: python -m src.storage.bin_store import)
+STORAGE_BACKEND = "tsv"
+
+# False: ayrıştırılmış kayıtlar bellekte tutulmaz, sorgular dosyayı akış halinde okur
+# (bellek kullanımı dosya boyutundan bağımsız, her sorgu disk okur).
+TRANSACTION_CACHE = True
+
+# "shared" (tek transactions.txt) ya da "sharded" (TRANSACTIONS_DIR/<user_id>.tsv;
+# bölme: python -m src.storage.shards migrate). Yalnızca TSV deposunda geçerlidir.
+TRANSACTIONS_LAYOUT = "shared"
+
+# True: TSV'de transactions.txt için user_id -> bayt ofseti yan dizini (<dosya>.idx) tutulur;
+# kullanıcı sorguları (bkz. TRANSACTION_CACHE = False) yalnızca o kullanıcının satırlarını okur.
+USER_OFFSET_INDEX = False
+
+# Sayfalı işlem listelerinde (menü, HTTP ?limit=) varsayılan sayfa boyutu.
+PAGE_SIZE = 20
+
+# TSV işlem dosyasının soğuk yüklemesi PARSE_PARALLEL_MIN_BYTES'tan büyükse dosya satır
+# sınırına hizalı PARSE_CHUNK_BYTES'lık parçalara bölünüp PARSE_WORKERS süreçte ayrıştırılır
+# (0: işlemci sayısı, 1: kapalı). Sonuç seri ayrıştırmayla aynıdır.
+PARSE_WORKERS = 0
+PARSE_CHUNK_BYTES = 16 * 1024 * 1024
+PARSE_PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+# Günlükte (ve toplam özeti fark günlüğünde, AGGREGATES_LOG_FILE) bu kadar kayıt
+# birikince ana dosyaya katlanır.
+JOURNAL_COMPACT_THRESHOLD = 200
+
+# Toplu yazma (create_transaction(commit="group")): satırlar bellekte biriktirilir ve
+# GROUP_COMMIT_ROWS satıra ya da ilk satırdan GROUP_COMMIT_DELAY saniye sonrasına kadar
+# tek yazmada dosyaya eklenir. Okumalar önce bekleyen satırları yazar.
+GROUP_COMMIT_ROWS = 256
+GROUP_COMMIT_DELAY = 0.2
+
+# True: her yazma (tek satır ya da grup) os.fsync ile diske zorlanır.
+WRITE_FSYNC = False
+
+# Şifreler PBKDF2-HMAC-SHA256 ile tuzlanıp saklanır; doğrulama maliyeti tur sayısıdır.
+# Değiştirilirse eski özetler geçerli kalır, girişte yeni tur sayısıyla yenilenir.
+PASSWORD_ITERATIONS = 200_000
+
+# Bellekteki oturumların (auth_service.start_session) geçerlilik süresi, saniye.
+SESSION_TTL = 12 * 60 * 60
+
+# True: servis ve txt_store çağrıları sayılır/süreleri ölçülür, çıkışta özet yazılır
+# (bkz. src.core.instrument). Ortam değişkeni EXPENSE_INSTRUMENT=1 ile de açılır;
+# değeri bir dosya yoluysa (ör. EXPENSE_INSTRUMENT=stats.json) özet JSON olarak oraya yazılır;
+# 0/false/no/off kapalı sayılır.
+INSTRUMENT = False
+INSTRUMENT_OUTPUT = None  # JSON dosyası; None: özet standart hataya yazılır
+
+# "python" ya da "numpy" (sütunlu vektörel raporlar; numpy kurulu değilse python'a düşer)
+REPORT_BACKEND = "python"
 
 
 def ensure_data_files_exist() -> None:
@@ -11,4 +72,6 @@ def ensure_data_files_exist() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     for p in (USERS_FILE, CATEGORIES_FILE, TRANSACTIONS_FILE):
         if not p.exists():
-            p.write_text("", encoding="utf-8")
\ No newline at end of file
+            p.write_text("", encoding="utf-8")
+    if TRANSACTIONS_LAYOUT == "sharded":
+        TRANSACTIONS_DIR.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
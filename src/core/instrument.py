@@ -0,0 +1,278 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.core import config
+
+# İsteğe bağlı ölçüm: txt_store ile auth/category/transaction/report servislerinin
+# açık (alt çizgisiz) fonksiyonları sarılır. Her fonksiyon için çağrı sayısı ve süre,
+# dosya başına okuma/yazma sayısı, okunan/yazılan bayt ve ayrıştırılan satır tutulur.
+# Dosya G/Ç'si o an çağrı yığınında olan her fonksiyona da yazılır; böylece örneğin
+# bir by_category çağrısının categories.txt'yi kaç kez okuduğu görülür.
+# Süreler kapsayıcıdır (iç çağrılar dahil); üreteçlerde yalnızca üretecin içinde
+# geçen süre sayılır. Okunan bayt, okumaya başlarken dosyanın boyutudur.
+#
+# Açma: config.INSTRUMENT = True ya da EXPENSE_INSTRUMENT=1 (özet standart hataya)
+# veya EXPENSE_INSTRUMENT=stats.json (JSON dosyasına). 0/false/no/off ya da boş değer
+# kapalı sayılır. Kapalıyken hiçbir şey sarılmaz.
+
+ENV_VAR = "EXPENSE_INSTRUMENT"
+MODULES = (
+    "src.storage.txt_store",
+    "src.services.auth_service",
+    "src.services.category_service",
+    "src.services.transaction_service",
+    "src.services.report_service",
+)
+
+_lock = threading.Lock()
+_local = threading.local()
+_calls: Dict[str, dict] = {}
+_files: Dict[str, dict] = {}
+_installed = False
+
+
+def _new_io() -> dict:
+    return {"reads": 0, "bytes_read": 0, "rows_parsed": 0, "writes": 0, "bytes_written": 0}
+
+
+def _stack() -> List[str]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _record_io(path: Path, **counts: int) -> None:
+    name = Path(path).name
+    with _lock:
+        targets = [_files.setdefault(name, _new_io())]
+        for fn in set(_stack()):
+            targets.append(_calls[fn]["files"].setdefault(name, _new_io()))
+        for t in targets:
+            for k, v in counts.items():
+                t[k] += v
+
+
+def _size(path: Path) -> int:
+    try:
+        return Path(path).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+class _Frame:
+    # Çağrı yığınına girer ve süreyi ölçer; özyinelemeli çağrılarda süre bir kez sayılır.
+    __slots__ = ("name", "outer", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        stack = _stack()
+        self.outer = self.name not in stack
+        stack.append(self.name)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _stack().pop()
+        if self.outer:
+            with _lock:
+                _calls[self.name]["time_s"] += elapsed
+
+
+def _count_call(name: str) -> None:
+    with _lock:
+        _calls[name]["calls"] += 1
+
+
+def _wrap(name: str, fn: Callable) -> Callable:
+    _calls.setdefault(name, {"calls": 0, "time_s": 0.0, "files": {}})
+    if inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            _count_call(name)
+            it = fn(*args, **kwargs)
+            try:
+                while True:
+                    with _Frame(name):
+                        try:
+                            item = next(it)
+                        except StopIteration:
+                            return
+                    yield item
+            finally:
+                it.close()
+
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        _count_call(name)
+        with _Frame(name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _io_hooks(txt_store) -> Dict[str, Callable]:
+    # txt_store'un dosyaya dokunan fonksiyonları; açık fonksiyonlar ayrıca zamanlanır
+    base_rows = txt_store._iter_base_rows
+    append_rows = txt_store.append_rows
+    write_rows = txt_store.write_rows
+    append_journal = txt_store._append_journal
+
+    @functools.wraps(base_rows)
+    def _iter_base_rows(path):
+        if not path.exists():
+            return
+        _record_io(path, reads=1, bytes_read=_size(path))
+        n = 0
+        try:
+            for row in base_rows(path):
+                n += 1
+                yield row
+        finally:
+            _record_io(path, rows_parsed=n)
+
+    @functools.wraps(append_rows)
+    def _append_rows(path, rows):
+        before = _size(path)
+        append_rows(path, rows)
+        _record_io(path, writes=1, bytes_written=_size(path) - before)
+
+    @functools.wraps(write_rows)
+    def _write_rows(path, rows):
+        write_rows(path, rows)
+        _record_io(path, writes=1, bytes_written=_size(path))
+
+    @functools.wraps(append_journal)
+    def _append_journal(path, record):
+        journal = txt_store.journal_path(path)
+        before = _size(journal)
+        append_journal(path, record)
+        # eşiğe ulaşılıp sıkıştırıldıysa günlük silinmiştir
+        _record_io(journal, writes=1, bytes_written=max(_size(journal) - before, 0))
+
+    return {
+        "_iter_base_rows": _iter_base_rows,
+        "append_rows": _append_rows,
+        "write_rows": _write_rows,
+        "_append_journal": _append_journal,
+    }
+
+
+def _patch(originals: Dict[int, Callable]) -> None:
+    # "from x import f" ile alınmış adlar da değişsin diye yüklü tüm src modülleri taranır
+    for mod in list(sys.modules.values()):
+        name = getattr(mod, "__name__", "")
+        if not (name == "src" or name.startswith("src.") or name == "__main__"):
+            continue
+        for attr, value in list(vars(mod).items()):
+            if callable(value) and id(value) in originals and value is originals[id(value)][0]:
+                setattr(mod, attr, originals[id(value)][1])
+
+
+_OFF = ("", "0", "false", "no", "off")
+_ON = ("1", "true", "yes", "on")
+
+
+def _env() -> str:
+    return os.environ.get(ENV_VAR, "").strip()
+
+
+def enabled() -> bool:
+    return bool(config.INSTRUMENT or _env().lower() not in _OFF)
+
+
+def output_path() -> str | None:
+    env = _env()
+    if env.lower() not in _OFF + _ON:
+        return env
+    return config.INSTRUMENT_OUTPUT
+
+
+def install() -> None:
+    global _installed
+    if _installed:
+        return
+    import importlib
+
+    replacements: Dict[int, tuple] = {}
+    for mod_name in MODULES:
+        mod = importlib.import_module(mod_name)
+        short = mod_name.rsplit(".", 1)[1]
+        hooks = _io_hooks(mod) if short == "txt_store" else {}
+        for attr, original in list(vars(mod).items()):
+            if not inspect.isfunction(original) or original.__module__ != mod_name:
+                continue
+            fn = hooks.pop(attr, original)
+            if not attr.startswith("_"):
+                fn = _wrap(f"{short}.{attr}", fn)
+            if fn is not original:
+                replacements[id(original)] = (original, fn)
+    _patch(replacements)
+    _installed = True
+
+
+def reset() -> None:
+    with _lock:
+        for c in _calls.values():
+            c.update(calls=0, time_s=0.0, files={})
+        _files.clear()
+
+
+def snapshot() -> dict:
+    with _lock:
+        calls = {
+            name: {"calls": c["calls"], "time_s": round(c["time_s"], 6), "files": {f: dict(v) for f, v in c["files"].items()}}
+            for name, c in _calls.items()
+            if c["calls"]
+        }
+        files = {f: dict(v) for f, v in _files.items()}
+    return {"calls": calls, "files": files}
+
+
+def summary() -> str:
+    snap = snapshot()
+    lines = [f"{'fonksiyon':<56}{'çağrı':>8}{'toplam ms':>12}{'ort. ms':>10}  okumalar"]
+    for name, c in sorted(snap["calls"].items(), key=lambda kv: -kv[1]["time_s"]):
+        reads = ", ".join(f"{f}×{v['reads']}" for f, v in sorted(c["files"].items()) if v["reads"])
+        ms = c["time_s"] * 1000
+        lines.append(f"{name:<56}{c['calls']:>8}{ms:>12.2f}{ms / c['calls']:>10.3f}  {reads}")
+    lines.append("")
+    lines.append(f"{'dosya':<28}{'okuma':>8}{'okunan bayt':>14}{'satır':>10}{'yazma':>8}{'yazılan bayt':>14}")
+    for name, v in sorted(snap["files"].items()):
+        lines.append(
+            f"{name:<28}{v['reads']:>8}{v['bytes_read']:>14}{v['rows_parsed']:>10}{v['writes']:>8}{v['bytes_written']:>14}"
+        )
+    return "\n".join(lines)
+
+
+def dump(path: Path | str) -> None:
+    Path(path).write_text(json.dumps(snapshot(), ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def report() -> None:
+    out = output_path()
+    if out:
+        dump(out)
+        print(f"Ölçüm özeti yazıldı -> {out}", file=sys.stderr)
+    else:
+        print(summary(), file=sys.stderr)
+
+
+def setup() -> None:
+    # Giriş noktalarından çağrılır; kapalıyken hiçbir şey yapmaz.
+    if enabled() and not _installed:
+        install()
+        atexit.register(report)
@@ -0,0 +1,37 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Tutarlar uçtan uca tam sayı kuruş olarak taşınır; float'a yalnızca gösterimde dönülür.
+
+_CENT = Decimal("0.01")
+
+
+def to_cents(amount_str: str) -> int:
+    # Kullanıcı girdisi: "12,5" / "12.50" / "1e3" -> kuruş; geçersizse ValueError
+    s = (amount_str or "").replace(",", ".").strip()
+    try:
+        val = Decimal(s)
+        if not val.is_finite():
+            raise ValueError
+        val = val.quantize(_CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        raise ValueError("Tutar Geçersiz.")
+    return int(val * 100)
+
+
+def parse_stored_cents(amount_s: str) -> int:
+    # Dosyadaki "12000.00" biçimi için hızlı yol; bozuk değer 0 sayılır.
+    s = (amount_s or "").replace(",", ".").strip()
+    whole, _, frac = s.partition(".")
+    if not (whole or frac):
+        return 0
+    if (whole and not whole.isdigit()) or (frac and not frac.isdigit()):
+        return 0
+    if len(frac) > 2:
+        return to_cents(s)
+    return int(whole or "0") * 100 + int((frac + "00")[:2])
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{frac:02d}"
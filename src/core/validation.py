@@ -1,6 +1,8 @@
 import re 
 from datetime import datetime
 
+from src.core.money import to_cents
+
 def normalize_username(name : str) -> str:
     return (name or "").strip().lower()
 
@@ -33,18 +35,15 @@ def validate_type_basic(type_:str) -> str:
         raise ValueError("Tür 'income' ya da 'expense' olsun" )
     return type_
 
-def validate_amount_basic(amount_str: str) -> float:
-    s= (amount_str or "").replace(",",".").strip()
-    try:
-        val = float(s)
-    except Exception:
-        raise ValueError("Tutar Geçersiz.")
-    if val <= 0:
+def validate_amount_basic(amount_str: str) -> int:
+    # kuruş cinsinden döner
+    cents = to_cents(amount_str)
+    if cents <= 0:
         raise ValueError("Tutar 0dan büyük olmalı")
-    return float(f"{val:.2f}")
+    return cents
 
 
-from datetime import datetime
+from datetime import date, datetime
 TRANSACTION_DATE_FMT = "%d-%m-%Y"
 
 def validate_date_basic(date_str: str | None) -> str:
@@ -61,6 +60,15 @@ def validate_date_basic(date_str: str | None) -> str:
     return dt.strftime(TRANSACTION_DATE_FMT)
 
 
+def date_ordinal(date_str: str) -> int:
+    # strptime yerine hızlı GG-AA-YYYY ayrıştırma; geçersizse datetime.min
+    try:
+        d, m, y = (date_str or "").strip().split("-")
+        return date(int(y), int(m), int(d)).toordinal()
+    except Exception:
+        return datetime.min.toordinal()
+
+
 def validate_description_basic(desc: str | None) -> str:
     desc = (desc or "").strip()
     for ch in ("\t","\r","\n"):
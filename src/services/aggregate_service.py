@@ -0,0 +1,235 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import AGGREGATES_FILE, AGGREGATES_LOG_FILE, JOURNAL_COMPACT_THRESHOLD
+from src.core.ids import new_id
+from src.storage import file_cache, locks
+from src.storage.backend import append_rows, read_rows, write_rows
+from src.services import transaction_service
+
+# Kullanıcı başına kalıcı toplam özeti (kuruş):
+#   S<TAB>kaynak dosya<TAB>dosyanın imzası (özetin karşılık geldiği hal)
+#   C<TAB>user_id<TAB>type<TAB>category_id<TAB>kuruş
+#   N<TAB>user_id<TAB>category_id<TAB>kayıt sayısı (kategori kullanım sayısı)
+#   V<TAB>biçim sürümü; eski sürümdeki özet okunurken tüm kaynaklar yeniden kurulur
+#   L<TAB>nesil (özetin üstüne uygulanacak fark günlüğünün kimliği)
+# Yazmalar özeti yeniden yazmaz; farklar AGGREGATES_LOG_FILE'a eklenir (WRITE_FSYNC'e uyar):
+#   G<TAB>nesil (ilk satır; özetteki L ile aynı değilse günlük yok sayılır)
+#   D<TAB>user_id<TAB>type<TAB>category_id<TAB>kuruş<TAB>kayıt sayısı
+#   S<TAB>kaynak dosya<TAB>yeni imza
+# Günlük JOURNAL_COMPACT_THRESHOLD satırı aşınca özet yeni nesille yeniden yazılır ve
+# günlük boşaltılır; arada kesilirse eski nesilli günlük yok sayılır (farklar özettedir).
+# Kaynak, kullanıcının işlem dosyasıdır (paylaşılan dosya ya da kullanıcının parçası).
+# İmza tutmuyorsa yalnızca o kaynağın kullanıcıları yeniden kurulur.
+# Önbellekteki özet yerinde değiştirilmez (eşzamanlı okuyucular için); yeni kopya
+# özet dosyasının özel kilidi altında kaydedilir. Kilit sırası: işlem dosyası, sonra özet.
+
+Delta = Tuple[str, str, Optional[str], int, int]  # (user_id, type, category_id, kuruş, kayıt sayısı)
+Token = Optional[Tuple[str, str]]  # (kaynak, imza)
+
+FORMAT_VERSION = "2"
+
+
+def _source_of(user_id: str) -> str:
+    try:
+        return str(transaction_service.source_path(user_id))
+    except ValueError:
+        return ""
+
+
+def _source_signature(src: str) -> str:
+    return repr(file_cache.signature(Path(src)))
+
+
+def _empty() -> Dict:
+    # log_rows: günlükteki fark satırı (None: günlük bu nesle ait değil, ilk yazma özeti yeniler)
+    return {"sources": {}, "users": {}, "gen": None, "log_rows": None, "log_sig": None}
+
+
+def _parse_snapshot(path) -> Dict:
+    snap = _empty()
+    version = None
+    # özet ve günlük, sıkıştırma arasına girmesin diye birlikte okunur
+    with locks.shared(AGGREGATES_FILE):
+        for row in read_rows(path):
+            if row[0] == "S" and len(row) >= 3:
+                snap["sources"][row[1]] = row[2]
+            elif row[0] == "C" and len(row) >= 5:
+                _, uid, t, cid, cents = row[:5]
+                _add(snap, uid, t, cid or None, int(cents), 0)
+            elif row[0] == "N" and len(row) >= 4:
+                _user(snap, row[1])["counts"][row[2]] = int(row[3])
+            elif row[0] == "V" and len(row) >= 2:
+                version = row[1]
+            elif row[0] == "L" and len(row) >= 2:
+                snap["gen"] = row[1]
+        if version != FORMAT_VERSION:
+            snap["sources"] = {}
+            snap["gen"] = None
+        _apply_log(snap)
+    return snap
+
+
+def _apply_log(snap: Dict) -> None:
+    snap["log_sig"] = file_cache.signature(AGGREGATES_LOG_FILE)
+    rows = read_rows(AGGREGATES_LOG_FILE) if AGGREGATES_LOG_FILE.exists() else []
+    if snap["gen"] is None or not rows or rows[0] != ["G", snap["gen"]]:
+        return
+    for row in rows[1:]:
+        if row[0] == "D" and len(row) >= 6:
+            _, uid, t, cid, cents, count = row[:6]
+            _add(snap, uid, t, cid or None, int(cents), int(count))
+        elif row[0] == "S" and len(row) >= 3:
+            snap["sources"][row[1]] = row[2]
+    snap["log_rows"] = len(rows) - 1
+
+
+def _load() -> Dict:
+    # özetin önbellek imzası günlüğü kapsamaz; günlük değiştiyse yeniden okunur
+    snap = file_cache.load(AGGREGATES_FILE, _parse_snapshot)
+    if snap["log_sig"] != file_cache.signature(AGGREGATES_LOG_FILE):
+        file_cache.invalidate(AGGREGATES_FILE)
+        snap = file_cache.load(AGGREGATES_FILE, _parse_snapshot)
+    return snap
+
+
+def _user(snap: Dict, user_id: str) -> Dict:
+    return snap["users"].setdefault(user_id, {"income": 0, "expense": 0, "categories": {}, "counts": {}})
+
+
+def _add(snap: Dict, user_id: str, type_: str, category_id: Optional[str], cents: int, count: int = 1) -> None:
+    user = _user(snap, user_id)
+    if type_ in ("income", "expense"):
+        user[type_] += cents
+    key = (type_, category_id or "")
+    user["categories"][key] = user["categories"].get(key, 0) + cents
+    if category_id and count:
+        n = user["counts"].get(category_id, 0) + count
+        if n:
+            user["counts"][category_id] = n
+        else:
+            del user["counts"][category_id]
+
+
+def _save(snap: Dict) -> None:
+    # özet yeni nesille yeniden yazılır, ardından günlük boşaltılır; özet dosyasının
+    # özel kilidi altında çağrılır
+    gen = new_id()
+    rows: List[List[str]] = [["V", FORMAT_VERSION], ["L", gen]]
+    rows += [["S", src, sig] for src, sig in snap["sources"].items()]
+    for uid, user in snap["users"].items():
+        for (t, cid), cents in user["categories"].items():
+            if cents:
+                rows.append(["C", uid, t, cid, str(cents)])
+        for cid, n in user["counts"].items():
+            rows.append(["N", uid, cid, str(n)])
+    AGGREGATES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    write_rows(AGGREGATES_FILE, rows)
+    write_rows(AGGREGATES_LOG_FILE, [["G", gen]])
+    file_cache.invalidate(AGGREGATES_FILE)
+
+
+def _copy(snap: Dict, user_ids) -> Dict:
+    # sığ kopya; yalnızca değişecek kullanıcılar derin kopyalanır
+    users = dict(snap["users"])
+    for uid in user_ids:
+        if uid in users:
+            u = users[uid]
+            users[uid] = {
+                "income": u["income"],
+                "expense": u["expense"],
+                "categories": dict(u["categories"]),
+                "counts": dict(u["counts"]),
+            }
+    return {**snap, "sources": dict(snap["sources"]), "users": users}
+
+
+def _rebuild(src: str) -> Dict:
+    # Kaynak, özet kilidi alınmadan okunur; imza okumadan önce alındığı için arada
+    # yazılan satırlar bir sonraki okumada yeniden kurulur.
+    sig = _source_signature(src)
+    fresh = _empty()
+    for r in transaction_service.iter_source(Path(src)):
+        _add(fresh, r["user_id"], r["type"], r["category_id"], r["amount_cents"])
+    with locks.exclusive(AGGREGATES_FILE):
+        snap = _copy(_load(), ())
+        for uid in [u for u in snap["users"] if _source_of(u) == src]:
+            del snap["users"][uid]
+        snap["users"].update(fresh["users"])
+        snap["sources"][src] = sig
+        _save(snap)
+    return snap
+
+
+def rebuild() -> Dict:
+    with locks.exclusive(AGGREGATES_FILE):
+        _save(_empty())
+    snap = _empty()
+    for path in transaction_service.source_paths():
+        snap = _rebuild(str(path))
+    return snap
+
+
+def _snapshot(user_id: str) -> Dict:
+    snap = _load()
+    src = _source_of(user_id)
+    if src and snap["sources"].get(src) != _source_signature(src):
+        snap = _rebuild(src)
+    return snap
+
+
+def begin(user_id: str) -> Token:
+    # Yazmadan önce çağrılır; kullanıcının kaynağı için özet tazeyse (kaynak, imza) döndürür.
+    snap = _load()
+    src = _source_of(user_id)
+    sig = snap["sources"].get(src)
+    return (src, sig) if src and sig == _source_signature(src) else None
+
+
+def commit(token: Token, deltas: List[Delta]) -> None:
+    # Yazmadan sonra çağrılır; özet yazmadan önce tazeyse farklar uygulanır,
+    # değilse dokunulmaz ve ilk okumada yeniden kurulur.
+    if token is None:
+        return
+    src, sig = token
+    with locks.exclusive(AGGREGATES_FILE):
+        snap = _load()
+        if snap["sources"].get(src) != sig:
+            return
+        snap = _copy(snap, {d[0] for d in deltas})
+        rows = []
+        for uid, t, cid, cents, count in deltas:
+            _add(snap, uid, t, cid, cents, count)
+            rows.append(["D", uid, t, cid or "", str(cents), str(count)])
+        snap["sources"][src] = _source_signature(src)
+        rows.append(["S", src, snap["sources"][src]])
+        if snap["log_rows"] is None or snap["log_rows"] + len(rows) > JOURNAL_COMPACT_THRESHOLD:
+            _save(snap)
+            return
+        append_rows(AGGREGATES_LOG_FILE, rows)
+        snap["log_rows"] += len(rows)
+        snap["log_sig"] = file_cache.signature(AGGREGATES_LOG_FILE)
+        file_cache.put(AGGREGATES_FILE, snap)
+
+
+def user_totals(user_id: str) -> Dict[str, int]:
+    uid = (user_id or "").strip()
+    user = _snapshot(uid)["users"].get(uid)
+    if not user:
+        return {"income": 0, "expense": 0}
+    return {"income": user["income"], "expense": user["expense"]}
+
+
+def category_totals(user_id: str, type_: str) -> List[Tuple[Optional[str], int]]:
+    uid = (user_id or "").strip()
+    user = _snapshot(uid)["users"].get(uid)
+    if not user:
+        return []
+    return [(cid or None, cents) for (t, cid), cents in user["categories"].items() if t == type_ and cents]
+
+
+def category_counts(user_id: str) -> Dict[str, int]:
+    # category_id -> kullanan kayıt sayısı (yalnızca kullanılanlar)
+    uid = (user_id or "").strip()
+    user = _snapshot(uid)["users"].get(uid)
+    return dict(user["counts"]) if user else {}
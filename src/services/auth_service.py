@@ -1,19 +1,118 @@
-from src.core.config import USERS_FILE
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+from src.core.config import PASSWORD_ITERATIONS, SESSION_TTL, USERS_FILE, USERS_INDEX_FILE
 from src.core.ids import new_id
 from src.core.validation import validate_password, validate_username, normalize_username
-from src.storage.txt_store import read_rows, append_row
+from src.storage import file_cache, locks
+from src.storage.backend import read_rows, append_row, update_row, write_rows
+
+# Kullanıcı dizini: normalize ad -> (user_id, ad, şifre özeti). users.txt'nin imzasıyla
+# birlikte USERS_INDEX_FILE'a yazılır; süreç başına bir kez yüklenir, imza tutmazsa
+# users.txt'den yeniden kurulur. Kayıt ve şifre yenileme dizini yerinde günceller.
+#   S<TAB>users.txt imzası
+#   U<TAB>normalize ad<TAB>user_id<TAB>ad<TAB>şifre özeti
+# Şifre özeti: pbkdf2_sha256$tur$tuz$özet (hex). Eski düz metin şifreler dizin
+# kurulurken users.txt'de özete çevrilir; eski tur sayılı özetler ilk başarılı girişte
+# yenilenir.
+
+HASH_PREFIX = "pbkdf2_sha256"
+
+Entry = tuple[str, str, str]  # (user_id, ad, şifre özeti)
+
+_sessions: dict[str, tuple[dict, float]] = {}  # token -> (kullanıcı, bitiş zamanı)
+_sessions_lock = threading.Lock()
+
+
+def hash_password(password: str, iterations: int = PASSWORD_ITERATIONS) -> str:
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{HASH_PREFIX}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def _parse_hash(stored: str) -> tuple[int, bytes, bytes] | None:
+    parts = stored.split("$")
+    if len(parts) != 4 or parts[0] != HASH_PREFIX:
+        return None
+    try:
+        return int(parts[1]), bytes.fromhex(parts[2]), bytes.fromhex(parts[3])
+    except ValueError:
+        return None
+
+
+def verify_password(password: str, stored: str) -> bool:
+    parsed = _parse_hash(stored)
+    if parsed is None:
+        # eski kayıt: düz metin
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    iterations, salt, digest = parsed
+    candidate = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return hmac.compare_digest(candidate, digest)
+
+
+def _needs_rehash(stored: str) -> bool:
+    parsed = _parse_hash(stored)
+    return parsed is None or parsed[0] != PASSWORD_ITERATIONS
+
+
+def _users_signature() -> str:
+    return repr(file_cache.signature(USERS_FILE))
+
+
+def _save_index(index: dict[str, Entry]) -> None:
+    rows = [["S", _users_signature()]]
+    rows += [["U", norm, *entry] for norm, entry in index.items()]
+    write_rows(USERS_INDEX_FILE, rows)
+
+
+def _hash_legacy_rows() -> list[list[str]]:
+    # users.txt'deki düz metin şifreleri özete çevirip dosyayı yeniden yazar; dizine
+    # (ve diske) düz metin şifre yazılmaz. Özel kilit altında çağrılır.
+    rows = read_rows(USERS_FILE)
+    legacy = False
+    for row in rows:
+        if len(row) >= 3 and _parse_hash(row[2]) is None:
+            row[2] = hash_password(row[2])
+            legacy = True
+    if legacy:
+        write_rows(USERS_FILE, rows)
+    return rows
+
+
+def _load_index(path) -> dict[str, Entry]:
+    if USERS_INDEX_FILE.exists():
+        rows = read_rows(USERS_INDEX_FILE)
+        if rows and rows[0] == ["S", _users_signature()]:
+            index = {r[1]: (r[2], r[3], r[4]) for r in rows[1:] if r[0] == "U" and len(r) >= 5}
+            # eski sürümün yazdığı, düz metin şifre içeren dizin yeniden kurulur
+            if all(_parse_hash(e[2]) is not None for e in index.values()):
+                return index
+    index: dict[str, Entry] = {}
+    with locks.exclusive(USERS_FILE):
+        for row in _hash_legacy_rows():
+            if len(row) < 3:
+                continue
+            uid, uname, pw = row[:3]
+            index.setdefault(normalize_username(uname), (uid, uname, pw))
+        _save_index(index)
+    return index
+
+
+def _user_index() -> dict[str, Entry]:
+    return file_cache.load(USERS_FILE, _load_index)
+
+
+def _set_entry(index: dict[str, Entry], norm: str, entry: Entry) -> None:
+    # index yazmadan önce alınmış dizindir; users.txt'ye yazdıktan sonra, dosyanın
+    # özel kilidi altında çağrılır (dizin yeniden kurulmaz)
+    index = dict(index)
+    index[norm] = entry
+    file_cache.put(USERS_FILE, index)
+    _save_index(index)
 
-def _username_exist(username: str) -> bool:
-    norm = normalize_username(username)
-    for row in read_rows(USERS_FILE):
-        if len(row) < 3:
-            continue
-        _, uname, _ = row
-        if normalize_username(uname) == norm:
-            return True
-            
-    return False
-       
 
 def register(username: str, pw1: str, pw2: str):
     validate_username(username)
@@ -22,23 +121,70 @@ def register(username: str, pw1: str, pw2: str):
 
     if pw1 != pw2 :
         raise ValueError("Şifreler farklı")
-    if _username_exist(username):
-        raise ValueError("Bu kullanıcı adı zaten alınmış")
-
     uid = new_id()
-    append_row(USERS_FILE, [uid , username.strip(), pw1])
+    credential = hash_password(pw1)
+    norm = normalize_username(username)
+    with locks.exclusive(USERS_FILE):
+        index = _user_index()
+        if norm in index:
+            raise ValueError("Bu kullanıcı adı zaten alınmış")
+        append_row(USERS_FILE, [uid , username.strip(), credential])
+        _set_entry(index, norm, (uid, username.strip(), credential))
     return{"user_id":uid , "username":username.strip()}
 
 
+def find_user(user_name: str) -> dict | None:
+    # şifresiz arama; yalnızca yerel araçlar (ör. dışa aktarma CLI) için
+    entry = _user_index().get(normalize_username(user_name))
+    if entry is None:
+        return None
+    return {"user_id": entry[0], "username": entry[1]}
+
+
+def _upgrade_password(norm: str, entry: Entry, password: str) -> None:
+    credential = hash_password(password)
+    with locks.exclusive(USERS_FILE):
+        index = _user_index()
+        if index.get(norm) != entry:
+            return  # başka bir oturum değiştirmiş
+        uid, uname, _ = entry
+        update_row(USERS_FILE, [uid, uname, credential])
+        _set_entry(index, norm, (uid, uname, credential))
+
+
 def login(user_name: str , password: str) -> dict:
     validate_username(user_name)
     validate_password(password)
     target = normalize_username(user_name)
 
-    for row in read_rows(USERS_FILE):
-        if len(row)<3:
-            continue
-        uid, uname, pw = row
-        if normalize_username(uname) == target and pw==password:
-            return {"user_id": uid , "username":uname}
-    raise ValueError("Kullanıcı adı ve şifre hatalı. ")
\ No newline at end of file
+    entry = _user_index().get(target)
+    if entry is None or not verify_password(password, entry[2]):
+        raise ValueError("Kullanıcı adı ve şifre hatalı. ")
+    if _needs_rehash(entry[2]):
+        _upgrade_password(target, entry, password)
+    return {"user_id": entry[0], "username": entry[1]}
+
+
+def start_session(user: dict) -> str:
+    token = secrets.token_urlsafe(32)
+    with _sessions_lock:
+        _sessions[token] = (user, time.monotonic() + SESSION_TTL)
+    return token
+
+
+def session_user(token: str) -> dict | None:
+    # diske dokunmaz; süresi dolmuş oturum silinir
+    with _sessions_lock:
+        item = _sessions.get(token or "")
+        if item is None:
+            return None
+        user, expires = item
+        if time.monotonic() >= expires:
+            del _sessions[token]
+            return None
+    return user
+
+
+def end_session(token: str) -> None:
+    with _sessions_lock:
+        _sessions.pop(token or "", None)
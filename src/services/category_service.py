@@ -1,15 +1,14 @@
-from src.core.config import CATEGORIES_FILE, TRANSACTIONS_FILE
+from src.core.config import CATEGORIES_FILE
 from src.core.ids import new_id
 from src.core.validation import validate_category_name, normalize_username
-from src.storage.txt_store import read_rows, append_row
+from src.storage import file_cache, locks
+from src.storage.backend import read_rows, append_row, update_row, delete_row
+from src.services import aggregate_service
 
 def _name_exists_for_user(user_id: str, name: str, type_: str) -> bool:
     target = normalize_username(name)
-    for row in read_rows(CATEGORIES_FILE):
-        if len(row) < 4:
-            continue
-        _, uid, t, nm = row
-        if uid == user_id and t == type_ and normalize_username(nm) == target:
+    for c in list_categories(user_id):
+        if c["type"] == type_ and normalize_username(c["name"]) == target:
             return True
     return False
 
@@ -18,22 +17,48 @@ def create_category(user_id: str, name: str, type_: str) -> dict:
     type_ = type_.lower().strip()
     if type_ not in ("income", "expense"):
         raise ValueError("Kategori türü 'income' veya 'expense' olmalıdır.")
-    if _name_exists_for_user(user_id, name, type_):
-        raise ValueError("Bu kategori adı zaten kullanılmakta (aynı türde).")
-
     cid = new_id()
-    append_row(CATEGORIES_FILE, [cid, user_id, type_, name.strip()])
+    with locks.exclusive(CATEGORIES_FILE):
+        if _name_exists_for_user(user_id, name, type_):
+            raise ValueError("Bu kategori adı zaten kullanılmakta (aynı türde).")
+        append_row(CATEGORIES_FILE, [cid, user_id, type_, name.strip()])
+        file_cache.invalidate(CATEGORIES_FILE)
     return {"category_id": cid, "user_id": user_id, "type": type_, "name": name.strip()}
 
-def list_categories(user_id: str) -> list[dict]:
-    items: list[dict] = []
-    for row in read_rows(CATEGORIES_FILE):
+def _parse_categories_file(path) -> dict[str, list[dict]]:
+    by_user: dict[str, list[dict]] = {}
+    for row in read_rows(path):
         if len(row) < 4:
             continue
         cid, uid, type_, nm = row
-        if uid == user_id:
-            items.append({"category_id": cid, "user_id": uid, "type": type_, "name": nm})
-    return items
+        by_user.setdefault(uid, []).append({"category_id": cid, "user_id": uid, "type": type_, "name": nm})
+    return by_user
+
+def list_categories(user_id: str) -> list[dict]:
+    by_user = file_cache.load(CATEGORIES_FILE, _parse_categories_file)
+    return [dict(c) for c in by_user.get(user_id, [])]
+
+def category_name_map(user_id: str) -> dict[str, str]:
+    # category_id -> name; dosya değişene kadar tek sefer kurulur
+    return file_cache.derive(
+        CATEGORIES_FILE,
+        ("names", user_id),
+        _parse_categories_file,
+        lambda by_user: {c["category_id"]: c["name"] for c in by_user.get(user_id, [])},
+    )
+
+def category_usage(user_id: str) -> dict[str, int]:
+    # category_id -> kullanan işlem sayısı; toplam özetiyle birlikte tutulur (bkz. aggregate_service)
+    return aggregate_service.category_counts(user_id)
+
+def list_categories_with_usage(user_id: str, type_: str) -> list[dict]:
+    usage = category_usage(user_id)
+    type_ = (type_ or "").strip().lower()
+    return [
+        {**c, "usage": usage.get(c["category_id"], 0)}
+        for c in list_categories(user_id)
+        if c["type"] == type_
+    ]
 
 def list_category_names_by_type(user_id: str, type_: str) -> list[str]:
     type_ = (type_ or "").strip().lower()
@@ -45,12 +70,16 @@ def list_category_names_grouped(user_id: str) -> dict:
     return {"income": inc, "expense": exp}
 
 def get_category_id_by_name(user_id: str, type_: str, name: str) -> str | None:
-    type_ = (type_ or "").strip().lower()
-    target = normalize_username(name)
-    for c in list_categories(user_id):
-        if c.get("type") == type_ and normalize_username(c.get("name", "")) == target:
-            return c["category_id"]
-    return None
+    # (tür, normalize ad) -> category_id; dosya değişene kadar tek sefer kurulur
+    ids = file_cache.derive(
+        CATEGORIES_FILE,
+        ("ids", user_id),
+        _parse_categories_file,
+        lambda by_user: {
+            (c["type"], normalize_username(c["name"])): c["category_id"] for c in reversed(by_user.get(user_id, []))
+        },
+    )
+    return ids.get(((type_ or "").strip().lower(), normalize_username(name)))
 
 def update_category_by_name(old_name: str, new_name: str, user_id: str, type_: str) -> None:
     validate_category_name(new_name)
@@ -58,54 +87,33 @@ def update_category_by_name(old_name: str, new_name: str, user_id: str, type_: s
     if type_ not in ("income", "expense"):
         raise ValueError("Tür 'income' veya 'expense' olmalı.")
 
-    rows = read_rows(CATEGORIES_FILE)
-    updated = False
-
-    for row in rows:
-        if len(row) >= 4:
-            cid, uid, t, nm = row
-            if uid == user_id and t == type_ and normalize_username(nm) == normalize_username(old_name):
-                if _name_exists_for_user(user_id, new_name, t):
-                    raise ValueError("Bu isim zaten mevcut .")
-                row[3] = new_name.strip()
-                updated = True
+    with locks.exclusive(CATEGORIES_FILE):
+        target = None
+        for c in list_categories(user_id):
+            if c["type"] == type_ and normalize_username(c["name"]) == normalize_username(old_name):
+                target = c
                 break
 
-    if not updated:
-        raise ValueError("Kategori bulunamadı.")
+        if target is None:
+            raise ValueError("Kategori bulunamadı.")
+        if _name_exists_for_user(user_id, new_name, type_):
+            raise ValueError("Bu isim zaten mevcut .")
 
-    with open(CATEGORIES_FILE, "w", encoding="utf-8") as f:
-        for r in rows:
-            f.write("\t".join(r) + "\n")
+        update_row(CATEGORIES_FILE, [target["category_id"], user_id, type_, new_name.strip()])
+        file_cache.invalidate(CATEGORIES_FILE)
 
 def delete_category_by_name(name: str, user_id: str, type_: str) -> None:
     type_ = (type_ or "").lower().strip()
     if type_ not in ("income", "expense"):
         raise ValueError("Tür 'income' veya 'expense' olmalı.")
 
-    cat_id = get_category_id_by_name(user_id, type_, name)
-    if not cat_id:
-        raise ValueError("Kategori bulunamadı veya size ait değil.")
+    with locks.exclusive(CATEGORIES_FILE):
+        cat_id = get_category_id_by_name(user_id, type_, name)
+        if not cat_id:
+            raise ValueError("Kategori bulunamadı veya size ait değil.")
 
-    for row in read_rows(TRANSACTIONS_FILE):
-        if len(row) >= 6 and (row[5] or "").strip() == cat_id:
+        if category_usage(user_id).get(cat_id):
             raise ValueError("Bu kategori kayıtlarca kullanılıyor, silinemez.")
 
-    rows = read_rows(CATEGORIES_FILE)
-    new_rows = []
-    deleted = False
-
-    for row in rows:
-        if len(row) >= 4:
-            cid, uid, t, nm = row
-            if uid == user_id and t == type_ and cid == cat_id:
-                deleted = True
-                continue
-        new_rows.append(row)
-
-    if not deleted:
-        raise ValueError("Kategori bulunamadı veya size ait değil.")
-
-    with open(CATEGORIES_FILE, "w", encoding="utf-8") as f:
-        for r in new_rows:
-            f.write("\t".join(r) + "\n")
+        delete_row(CATEGORIES_FILE, cat_id)
+        file_cache.invalidate(CATEGORIES_FILE)
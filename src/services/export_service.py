@@ -0,0 +1,179 @@
+import argparse
+import csv
+import json
+import sys
+from datetime import date
+from itertools import chain
+from typing import Dict, Iterable, Iterator, Optional, Sequence, TextIO
+
+from src.core.money import format_cents
+from src.core.validation import date_ordinal, validate_date_basic, validate_type_basic
+from src.services import auth_service, category_service, report_service, transaction_service
+
+# İşlemleri ve rapor tablolarını CSV ya da JSON Lines olarak dışa aktarır.
+# Satırlar üreteçlerle doğrudan dosyaya yazılır; ara liste kurulmaz.
+
+FORMATS = ("csv", "jsonl")
+TRANSACTION_FIELDS = ("transaction_id", "date", "type", "amount", "category", "description")
+
+
+def iter_transactions(
+    user_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    type_: Optional[str] = None,
+    category_id: Optional[str] = None,
+) -> Iterator[Dict]:
+    # Süzgeçler yazmaya başlamadan doğrulanır; kayıtlar dosya sırasıyla, tarih uçları dahil
+    uid = (user_id or "").strip()
+    lo = date_ordinal(validate_date_basic(start)) if start else None
+    hi = date_ordinal(validate_date_basic(end)) if end else None
+    t = validate_type_basic(type_) if type_ else None
+    return _iter_filtered(uid, lo, hi, t, category_id)
+
+
+def _iter_filtered(uid: str, lo: Optional[int], hi: Optional[int], t: Optional[str], category_id) -> Iterator[Dict]:
+    names = category_service.category_name_map(uid)
+    for x in transaction_service.iter_transactions(uid, t):
+        if category_id and x["category_id"] != category_id:
+            continue
+        if lo is not None or hi is not None:
+            d = date_ordinal(x["date"])
+            if (lo is not None and d < lo) or (hi is not None and d > hi):
+                continue
+        cid = x["category_id"]
+        yield {
+            "transaction_id": x["transaction_id"],
+            "date": x["date"],
+            "type": x["type"],
+            "amount": format_cents(x["amount_cents"]),
+            "category": (names.get(cid) or "").strip() if cid else "",
+            "description": x["description"],
+        }
+
+
+def write_rows(rows: Iterable[Dict], f: TextIO, fmt: str = "csv", fields: Optional[Sequence[str]] = None) -> int:
+    if fmt not in FORMATS:
+        raise ValueError("Biçim 'csv' ya da 'jsonl' olmalı.")
+    rows = iter(rows)
+    if fields is None:
+        # alan adları ilk satırdan
+        first = next(rows, None)
+        if first is None:
+            return 0
+        fields = list(first)
+        rows = chain([first], rows)
+    count = 0
+    if fmt == "csv":
+        w = csv.DictWriter(f, fieldnames=list(fields), extrasaction="ignore", lineterminator="\n")
+        w.writeheader()
+        for r in rows:
+            w.writerow(r)
+            count += 1
+    else:
+        for r in rows:
+            f.write(json.dumps({k: r.get(k) for k in fields}, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def export_transactions(user_id: str, f: TextIO, fmt: str = "csv", **filters) -> int:
+    return write_rows(iter_transactions(user_id, **filters), f, fmt, TRANSACTION_FIELDS)
+
+
+def table_rows(result, fields: Optional[Sequence[str]] = None, money: Sequence[str] = ()) -> Iterator[Dict]:
+    # report_service sonuçlarını satırlara çevirir:
+    #   list[dict] -> olduğu gibi, dict (özet) -> tek satır,
+    #   list[tuple] / dict[anahtar, değer] (fields verilmişse) -> fields ile adlandırılır
+    names = fields or ("name", "value")
+    if isinstance(result, dict):
+        items = (dict(zip(names, kv)) for kv in result.items()) if fields else iter([result])
+    else:
+        items = (r if isinstance(r, dict) else dict(zip(names, r)) for r in result)
+    for r in items:
+        yield {k: format_cents(v) if k in money else v for k, v in r.items()}
+
+
+def export_table(
+    result,
+    f: TextIO,
+    fmt: str = "csv",
+    fields: Optional[Sequence[str]] = None,
+    money: Sequence[str] = (),
+) -> int:
+    return write_rows(table_rows(result, fields, money), f, fmt, None)
+
+
+# CLI raporları: ad -> (çağrı, sütun adları, tutar sütunları)
+REPORTS = {
+    "totals": (lambda uid, a: report_service.totals_all(uid), None, ("income", "expense", "net")),
+    "week": (lambda uid, a: report_service.weekly_summary(uid), None, ("income", "expense", "net")),
+    "month": (lambda uid, a: report_service.current_month_summary(uid), None, ("income", "expense", "net")),
+    "range": (
+        lambda uid, a: report_service.range_summary(uid, a.start, a.end),
+        None,
+        ("income", "expense", "net"),
+    ),
+    "last12": (lambda uid, a: report_service.last_12_months_table(uid), None, ("income", "expense", "balance")),
+    "by-category": (
+        lambda uid, a: report_service.by_category(uid, a.type or "expense", a.start, a.end),
+        ("category", "amount"),
+        ("amount",),
+    ),
+    "monthly": (
+        lambda uid, a: report_service.monthly_breakdown(uid, a.year, a.type),
+        ("month", "amount"),
+        ("amount",),
+    ),
+}
+
+
+def _category_id(user_id: str, name: str, type_: Optional[str]) -> str:
+    types = [type_] if type_ else ["income", "expense"]
+    for t in types:
+        cid = category_service.get_category_id_by_name(user_id, t, name)
+        if cid:
+            return cid
+    raise ValueError(f"Kategori bulunamadı: {name}")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    p = argparse.ArgumentParser(prog="python -m src.services.export_service")
+    p.add_argument("username")
+    p.add_argument("what", choices=["transactions", *REPORTS])
+    p.add_argument("--from", dest="start", help="GG-AA-YYYY")
+    p.add_argument("--to", dest="end", help="GG-AA-YYYY")
+    p.add_argument("--type", choices=["income", "expense"])
+    p.add_argument("--category", help="kategori adı")
+    p.add_argument("--year", type=int, default=None)
+    p.add_argument("--format", choices=FORMATS, default="csv")
+    p.add_argument("-o", "--output", help="dosya (varsayılan: standart çıktı)")
+    a = p.parse_args(argv)
+
+    user = auth_service.find_user(a.username)
+    if user is None:
+        p.exit(1, "Kullanıcı bulunamadı.\n")
+    uid = user["user_id"]
+    out = open(a.output, "w", encoding="utf-8", newline="") if a.output else sys.stdout
+    try:
+        if a.what == "transactions":
+            cid = _category_id(uid, a.category, a.type) if a.category else None
+            n = export_transactions(uid, out, a.format, start=a.start, end=a.end, type_=a.type, category_id=cid)
+        else:
+            if a.what == "monthly" and a.year is None:
+                a.year = date.today().year
+            if a.what == "range" and not (a.start and a.end):
+                p.exit(2, "range için --from ve --to gerekli.\n")
+            build, fields, money = REPORTS[a.what]
+            n = export_table(build(uid, a), out, a.format, fields, money)
+    except ValueError as e:
+        p.exit(1, f"{e}\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if a.output:
+        print(f"{n} satır yazıldı -> {a.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import csv
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from src.core.ids import new_id
+from src.core.money import format_cents
+from src.core.validation import (
+    normalize_username,
+    validate_type_basic,
+    validate_amount_basic,
+    validate_date_basic,
+    validate_description_basic,
+)
+from src.storage import backend, file_cache, locks
+from src.services import aggregate_service, category_service, transaction_service
+
+# Banka ekstresi / CSV / TSV toplu içe aktarma. İlk satır başlıktır; sütun adları
+# aşağıdaki eş anlamlılardan biri olabilir, sıra önemli değildir. Tür sütunu yoksa
+# tutarın işareti kullanılır (eksi: gider). Kategori, kullanıcının kategori adıdır.
+COLUMNS = {
+    "date": ("date", "tarih"),
+    "type": ("type", "tür", "tur"),
+    "amount": ("amount", "tutar"),
+    "category": ("category", "kategori"),
+    "description": ("description", "açıklama", "aciklama"),
+}
+
+RowError = Tuple[int, str]  # (satır no, hata)
+
+
+def _delimiter(header_line: str) -> str:
+    for d in ("\t", ";"):
+        if d in header_line:
+            return d
+    return ","
+
+
+def _columns(header: List[str]) -> Dict[str, int]:
+    names = [(h or "").strip().lower() for h in header]
+    cols: Dict[str, int] = {}
+    for key, aliases in COLUMNS.items():
+        for i, n in enumerate(names):
+            if n in aliases:
+                cols[key] = i
+                break
+    if "date" not in cols or "amount" not in cols:
+        raise ValueError("Dosyada tarih (date) ve tutar (amount) sütunları olmalı.")
+    return cols
+
+
+def _category_map(user_id: str) -> Dict[Tuple[str, str], str]:
+    # (tür, normalize ad) -> category_id; içe aktarma boyunca bir kez kurulur
+    return {
+        (c["type"], normalize_username(c["name"])): c["category_id"]
+        for c in category_service.list_categories(user_id)
+    }
+
+
+def _iter_records(f, delimiter: str) -> Iterator[Tuple[int, List[str]]]:
+    reader = csv.reader(f, delimiter=delimiter)
+    for row in reader:
+        if any((v or "").strip() for v in row):
+            yield reader.line_num, row
+
+
+def _convert(row: List[str], cols: Dict[str, int], categories: Dict) -> Tuple[str, int, str, str | None, str]:
+    def col(key: str) -> str:
+        i = cols.get(key)
+        return row[i] if i is not None and i < len(row) else ""
+
+    amount_s = col("amount").strip()
+    if "type" in cols:
+        type_ = validate_type_basic(col("type"))
+    else:
+        type_ = "expense" if amount_s.startswith("-") else "income"
+        if amount_s[:1] in ("+", "-"):
+            amount_s = amount_s[1:]
+        if amount_s[:1] in ("+", "-"):
+            raise ValueError("Tutar Geçersiz.")
+    amount = validate_amount_basic(amount_s)
+    # ekstrede tarihsiz satır hatadır (elle girişteki gibi bugüne tamamlanmaz)
+    if not col("date").strip():
+        raise ValueError("Tarih boş olamaz.")
+    date_out = validate_date_basic(col("date"))
+
+    category_id = None
+    cat_name = col("category").strip()
+    if cat_name:
+        category_id = categories.get((type_, normalize_username(cat_name)))
+        if category_id is None:
+            raise ValueError(f"Kategori bulunamadı: {cat_name} ({type_})")
+    return type_, amount, date_out, category_id, validate_description_basic(col("description"))
+
+
+def import_transactions(user_id: str, source: Path | str) -> Dict:
+    # Geçerli satırlar tek seferde eklenir; geçersiz satırlar atlanır ve raporlanır.
+    uid = (user_id or "").strip()
+    source = Path(source)
+    if not source.exists():
+        raise ValueError("Dosya bulunamadı.")
+
+    categories = _category_map(uid)
+    rows: List[List[str]] = []
+    errors: List[RowError] = []
+    deltas: Dict[Tuple[str, str | None], List[int]] = {}  # (tür, kategori) -> [kuruş, kayıt]
+
+    with source.open("r", encoding="utf-8-sig", newline="") as f:
+        header_line = f.readline()
+        delimiter = _delimiter(header_line)
+        cols = _columns(next(csv.reader([header_line], delimiter=delimiter), []))
+        for line_no, row in _iter_records(f, delimiter):
+            try:
+                type_, amount, date_out, category_id, desc = _convert(row, cols, categories)
+            except ValueError as e:
+                errors.append((line_no + 1, str(e)))  # +1: başlık satırı
+                continue
+            rows.append([new_id(), uid, date_out, type_, format_cents(amount), category_id or "", desc])
+            d = deltas.setdefault((type_, category_id), [0, 0])
+            d[0] += amount
+            d[1] += 1
+
+    if rows:
+        path = transaction_service.source_path(uid)
+        with locks.exclusive(path):
+            token = aggregate_service.begin(uid)
+            backend.append_rows(path, rows)
+            file_cache.invalidate(path)
+            aggregate_service.commit(token, [(uid, t, cid, cents, n) for (t, cid), (cents, n) in deltas.items()])
+
+    return {"imported": len(rows), "errors": errors}
@@ -1,12 +1,16 @@
 from __future__ import annotations
 from collections import defaultdict
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
 from calendar import monthrange
-from typing import Dict, List, Tuple, Iterable, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 
-from src.core.validation import TRANSACTION_DATE_FMT
-from src.services import transaction_service
+from src.core.config import REPORT_BACKEND
+from src.core.validation import TRANSACTION_DATE_FMT, date_ordinal
+from src.services import aggregate_service, category_service, transaction_service
+from src.storage import columnar
 
+# Tüm toplamlar kuruş (int) döner; biçimlendirme arayüzde format_cents ile yapılır.
 
 def _parse_date(s: str) -> datetime:
     try:
@@ -15,150 +19,246 @@ def _parse_date(s: str) -> datetime:
         return datetime.min
 
 
-def _iter_rows(
-    user_id: str,
-    type_: Optional[str] = None,
-    start: Optional[datetime] = None,
-    end: Optional[datetime] = None,
-) -> Iterable[Dict]:
-    rows = transaction_service.list_transactions(user_id, type_)
-    for r in rows:
-        dt = _parse_date(r.get("date", ""))
-        if start and dt < start:
-            continue
-        if end and dt > end:
-            continue
-        yield r
+def _cents(r: Dict) -> int:
+    return r.get("amount_cents", 0)
 
 
-def _sum_by_type(rows: Iterable[Dict]) -> Dict[str, float]:
-    inc = exp = 0.0
+def _build_date_index(rows: List[Dict]) -> Dict:
+    # rows tarih sıralı gelir; gelir/gider önek toplamları kuruş cinsinden tutulur
+    ords: List[int] = []
+    inc = [0]
+    exp = [0]
     for r in rows:
+        ords.append(date_ordinal(r.get("date", "")))
+        cents = _cents(r)
+        i, e = inc[-1], exp[-1]
         if r.get("type") == "income":
-            inc += r.get("amount", 0.0)
+            i += cents
         elif r.get("type") == "expense":
-            exp += r.get("amount", 0.0)
-    return {
-        "income": round(inc, 2),
-        "expense": round(exp, 2),
-        "net": round(inc - exp, 2),
-    }
+            e += cents
+        inc.append(i)
+        exp.append(e)
+    return {"ords": ords, "rows": rows, "inc": inc, "exp": exp}
+
+
+def _date_index(user_id: str) -> Dict:
+    return transaction_service.user_view(user_id, "date_index", _build_date_index)
+
+
+def _bounds(idx: Dict, start: Optional[int], end: Optional[int]) -> Tuple[int, int]:
+    lo = bisect_left(idx["ords"], start) if start is not None else 0
+    hi = bisect_right(idx["ords"], end) if end is not None else len(idx["ords"])
+    return lo, max(lo, hi)
+
+
+def _columnar_table() -> Optional[Dict]:
+    if REPORT_BACKEND != "numpy" or not columnar.available():
+        return None
+    if not transaction_service.caching() or transaction_service.sharded():
+        return None
+    return transaction_service.table_view(
+        "columnar",
+        lambda by_user: columnar.build_table(by_user, date_ordinal, _cents),
+    )
+
+
+def _range_cents(user_id: str, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+    table = _columnar_table()
+    if table is not None:
+        sl = columnar.user_slice(table, user_id, start, end)
+        types = table["type"][sl]
+        cents = table["cents"][sl]
+        inc = int(cents[types == columnar.TYPE_CODES["income"]].sum())
+        exp = int(cents[types == columnar.TYPE_CODES["expense"]].sum())
+        return inc, exp
+    if not transaction_service.caching():
+        inc = exp = 0
+        for r in _stream_window(user_id, None, start, end):
+            if r.get("type") == "income":
+                inc += _cents(r)
+            elif r.get("type") == "expense":
+                exp += _cents(r)
+        return inc, exp
+    idx = _date_index(user_id)
+    lo, hi = _bounds(idx, start, end)
+    return idx["inc"][hi] - idx["inc"][lo], idx["exp"][hi] - idx["exp"][lo]
+
+
+def _stream_window(
+    user_id: str,
+    type_: Optional[str],
+    start: Optional[int],
+    end: Optional[int],
+) -> Iterable[Dict]:
+    # Önbelleksiz mod: kayıtlar okunurken süzülür, liste kurulmaz.
+    for r in transaction_service.iter_transactions(user_id, type_):
+        o = date_ordinal(r.get("date", ""))
+        if (start is None or o >= start) and (end is None or o <= end):
+            yield r
+
+
+def _sum_range(user_id: str, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, int]:
+    inc, exp = _range_cents(user_id, start, end)
+    return {"income": inc, "expense": exp, "net": inc - exp}
 
 
-def totals_all(user_id: str) -> Dict[str, float]:
-    return _sum_by_type(_iter_rows(user_id, None, None, None))
+def totals_all(user_id: str) -> Dict[str, int]:
+    t = aggregate_service.user_totals(user_id)
+    return {"income": t["income"], "expense": t["expense"], "net": t["income"] - t["expense"]}
 
 
-def weekly_summary(user_id: str) -> Dict[str, float]:
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    start = today - timedelta(days=6)
-    end = today + timedelta(hours=23, minutes=59, seconds=59)
-    return _sum_by_type(_iter_rows(user_id, None, start, end))
+def weekly_summary(user_id: str) -> Dict[str, int]:
+    today = date.today().toordinal()
+    return _sum_range(user_id, today - 6, today)
 
 
-def current_month_summary(user_id: str) -> Dict[str, float]:
+def current_month_summary(user_id: str) -> Dict[str, int]:
     now = datetime.now()
-    first = datetime(year=now.year, month=now.month, day=1)
+    first = date(now.year, now.month, 1).toordinal()
     last_day = monthrange(now.year, now.month)[1]
-    last = datetime(year=now.year, month=now.month, day=last_day, hour=23, minute=59, second=59)
-    return _sum_by_type(_iter_rows(user_id, None, first, last))
+    return _sum_range(user_id, first, first + last_day - 1)
 
 
-def range_summary(user_id: str, start_str: str, end_str: str) -> Dict[str, float]:
+def range_summary(user_id: str, start_str: str, end_str: str) -> Dict[str, int]:
     start = _parse_date(start_str)
     end = _parse_date(end_str)
     if start == datetime.min or end == datetime.min:
         raise ValueError(f"Tarih formatı {TRANSACTION_DATE_FMT} olmalı.")
     if start > end:
         raise ValueError("Başlangıç tarihi, bitişten büyük olamaz.")
-    end = end.replace(hour=23, minute=59, second=59)
-    return _sum_by_type(_iter_rows(user_id, None, start, end))
+    return _sum_range(user_id, start.toordinal(), end.toordinal())
+
+
+def _bucket_by_month(rows: Iterable[Dict]) -> Dict[Tuple[int, int, Optional[str]], int]:
+    # Tek geçişte (yıl, ay, tür) kovaları (kuruş); tür None olan kova iki türün toplamı.
+    buckets: Dict[Tuple[int, int, Optional[str]], int] = defaultdict(int)
+    for r in rows:
+        dt = _parse_date(r.get("date", ""))
+        amt = _cents(r)
+        buckets[(dt.year, dt.month, r.get("type"))] += amt
+        buckets[(dt.year, dt.month, None)] += amt
+    return dict(buckets)
+
+
+def _bucket_by_month_columnar(table: Dict, user_id: str) -> Dict[Tuple[int, int, Optional[str]], int]:
+    np = columnar.np
+    sl = columnar.user_slice(table, user_id)
+    days = (table["ord"][sl] - date(1970, 1, 1).toordinal()).astype("datetime64[D]")
+    months = days.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+    types = table["type"][sl]
+    cents = table["cents"][sl]
+    buckets: Dict[Tuple[int, int, Optional[str]], int] = {}
+    for t_name, code in (*columnar.TYPE_CODES.items(), (None, None)):
+        mask = slice(None) if code is None else types == code
+        keys, sums, _ = columnar.group_sum(months[mask], cents[mask])
+        for k, v in zip(keys.tolist(), sums.tolist()):
+            yr, mo0 = divmod(k, 12)
+            buckets[(yr, mo0 + 1, t_name)] = v
+    return buckets
+
+
+def _month_buckets(user_id: str) -> Dict[Tuple[int, int, Optional[str]], int]:
+    table = _columnar_table()
+    if table is not None:
+        return _bucket_by_month_columnar(table, user_id)
+    if not transaction_service.caching():
+        return _bucket_by_month(transaction_service.iter_transactions(user_id))
+    return transaction_service.user_view(user_id, "month_buckets", _bucket_by_month)
 
 
 def last_12_months_table(user_id: str) -> list[dict]:
+    buckets = _month_buckets(user_id)
     out: list[dict] = []
     today = datetime.now()
     for i in range(11, -1, -1):
-        target = today.replace(day=15) - timedelta(days=i * 30)
-        yr = target.year
-        mo = target.month
-        first = datetime(year=yr, month=mo, day=1)
-        last_day = monthrange(yr, mo)[1]
-        last = datetime(year=yr, month=mo, day=last_day, hour=23, minute=59, second=59)
-        sums = _sum_by_type(_iter_rows(user_id, None, first, last))
+        yr, mo0 = divmod(today.year * 12 + today.month - 1 - i, 12)
+        mo = mo0 + 1
+        inc = buckets.get((yr, mo, "income"), 0)
+        exp = buckets.get((yr, mo, "expense"), 0)
         out.append({
             "period": f"{yr}-{mo:02d}",
-            "income": sums["income"],
-            "expense": sums["expense"],
-            "balance": sums["net"],
+            "income": inc,
+            "expense": exp,
+            "balance": inc - exp,
         })
     return out
 
 
+def _category_cents(
+    user_id: str,
+    type_: str,
+    start: Optional[int],
+    end: Optional[int],
+) -> List[Tuple[Optional[str], int]]:
+    # (category_id, kuruş) çiftleri, kategorinin ilk görüldüğü sırayla
+    table = _columnar_table()
+    if table is not None:
+        np = columnar.np
+        sl = columnar.user_slice(table, user_id, start, end)
+        mask = table["type"][sl] == columnar.TYPE_CODES.get(type_, -1)
+        codes, sums, first = columnar.group_sum(table["cat"][sl][mask], table["cents"][sl][mask])
+        order = np.argsort(first, kind="stable")
+        cat_ids = table["cat_ids"]
+        return [(cat_ids[codes[i]], int(sums[i])) for i in order.tolist()]
+    if transaction_service.caching():
+        idx = _date_index(user_id)
+        lo, hi = _bounds(idx, start, end)
+        rows = (r for r in idx["rows"][lo:hi] if r.get("type") == type_)
+    else:
+        rows = _stream_window(user_id, type_, start, end)
+    bucket: Dict[Optional[str], int] = defaultdict(int)
+    for r in rows:
+        bucket[r.get("category_id")] += _cents(r)
+    return list(bucket.items())
+
+
 def by_category(
     user_id: str,
     type_: str,
     start: Optional[str] = None,
     end: Optional[str] = None,
-) -> List[Tuple[str, float]]:
+) -> List[Tuple[str, int]]:
     t_filter = (type_ or "").strip().lower()
-    start_dt = _parse_date(start) if start else None
-    end_dt = _parse_date(end) if end else None
-    if end_dt:
-        end_dt = end_dt.replace(hour=23, minute=59, second=59)
-    rows = _iter_rows(user_id, t_filter, start_dt, end_dt)
-    bucket = defaultdict(float)
-    for r in rows:
-        name = transaction_service.get_category_name_by_id(user_id, r.get("category_id")) or "(yok)"
-        bucket[name] += float(r.get("amount", 0.0))
+    start_ord = _parse_date(start).toordinal() if start else None
+    end_ord = _parse_date(end).toordinal() if end else None
+    names = category_service.category_name_map(user_id)
+    if start_ord is None and end_ord is None:
+        pairs = aggregate_service.category_totals(user_id, t_filter)
+    else:
+        pairs = _category_cents(user_id, t_filter, start_ord, end_ord)
+    bucket: Dict[str, int] = defaultdict(int)
+    for cid, cents in pairs:
+        name = (names.get(cid) if cid else None) or "(yok)"
+        bucket[name] += cents
     out = sorted(bucket.items(), key=lambda x: x[1], reverse=True)
-    return [(k, round(v, 2)) for k, v in out]
-
-
-def _filter_by_type(user_id: str, type_: str) -> List[Dict]:
-    return transaction_service.list_transactions(user_id, type_)
+    return out
 
 
-def total_by_type(user_id: str, type_: str) -> float:
-    rows = _filter_by_type(user_id, type_)
-    return round(sum(r.get("amount", 0.0) for r in rows), 2)
+def total_by_type(user_id: str, type_: str) -> int:
+    return aggregate_service.user_totals(user_id).get((type_ or "").strip(), 0)
 
 
-def total_income(user_id: str) -> float:
+def total_income(user_id: str) -> int:
     return total_by_type(user_id, "income")
 
 
-def total_expense(user_id: str) -> float:
+def total_expense(user_id: str) -> int:
     return total_by_type(user_id, "expense")
 
 
-def balance(user_id: str) -> float:
-    return round(total_income(user_id) - total_expense(user_id), 2)
+def balance(user_id: str) -> int:
+    t = aggregate_service.user_totals(user_id)
+    return t["income"] - t["expense"]
 
 
-def totals_last_n_days(user_id: str, n: int) -> Dict[str, float]:
-    rows = transaction_service.list_transactions(user_id, None)
+def totals_last_n_days(user_id: str, n: int) -> Dict[str, int]:
     cutoff = datetime.now() - timedelta(days=n)
-    inc = exp = 0.0
-    for r in rows:
-        dt = _parse_date(r.get("date", ""))
-        if dt >= cutoff:
-            if r.get("type") == "income":
-                inc += r.get("amount", 0.0)
-            elif r.get("type") == "expense":
-                exp += r.get("amount", 0.0)
-    return {
-        "income": round(inc, 2),
-        "expense": round(exp, 2),
-        "net": round(inc - exp, 2),
-    }
+    # kayıtlar gece yarısı sayılır; saat geçmişse o gün pencereye girmez
+    start = cutoff.toordinal() + (1 if cutoff.time() != time.min else 0)
+    return _sum_range(user_id, start, None)
 
 
-def monthly_breakdown(user_id: str, year: int, type_: str | None = None) -> Dict[int, float]:
-    rows = transaction_service.list_transactions(user_id, type_)
-    totals = {m: 0.0 for m in range(1, 13)}
-    for r in rows:
-        dt = _parse_date(r.get("date", ""))
-        if dt.year == year:
-            totals[dt.month] += r.get("amount", 0.0)
-    return {m: round(v, 2) for m, v in totals.items()}
+def monthly_breakdown(user_id: str, year: int, type_: str | None = None) -> Dict[int, int]:
+    buckets = _month_buckets(user_id)
+    t = (type_ or "").strip() or None
+    return {m: buckets.get((year, m, t), 0) for m in range(1, 13)}
@@ -1,17 +1,23 @@
+import heapq
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import List, Dict
-from src.core.config import TRANSACTIONS_FILE
-from src.storage.txt_store import read_rows, append_row
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple
+from src.core.config import PAGE_SIZE, TRANSACTION_CACHE, TRANSACTIONS_FILE, TRANSACTIONS_LAYOUT
+from src.storage import backend, bin_store, chunks, file_cache, locks, shards, txt_store
+from src.storage.backend import append_row, update_row, delete_row
 from src.core.ids import new_id
+from src.core.money import format_cents, parse_stored_cents
 from src.core.validation import (
     TRANSACTION_DATE_FMT,
+    date_ordinal,
     validate_type_basic,
     validate_amount_basic,
     validate_date_basic,
     validate_description_basic,
     validate_category_id_basic,
 )
-from src.services import category_service
+from src.services import aggregate_service, category_service
 
 def list_categories_for_type(user_id: str, type_: str) -> List[Dict]:
     type_ = (type_ or "").strip().lower()
@@ -24,10 +30,7 @@ def list_categories_for_type(user_id: str, type_: str) -> List[Dict]:
 def get_category_name_by_id(user_id: str, category_id):
     if not category_id:
         return None
-    for c in category_service.list_categories(user_id):
-        if c["category_id"] == category_id:
-            return c["name"]
-    return None
+    return category_service.category_name_map(user_id).get(category_id)
 
 def _ensure_category_belongs_to_user(user_id: str, category_id, type_: str) -> None:
     if not category_id:
@@ -45,7 +48,13 @@ def create_transaction(
     date_str,
     category_id,
     description: str = "",
+    commit: str = "row",
 ):
+    # commit="row": satır hemen yazılır (WRITE_FSYNC ise diske zorlanır).
+    # commit="group": satır toplu yazma grubuna eklenir (bkz. txt_store.buffer_row);
+    # grup yazılana kadar bu süreç dışındaki okuyucular satırı görmez.
+    if commit not in ("row", "group"):
+        raise ValueError("commit 'row' ya da 'group' olmalı.")
     type_ = validate_type_basic(type_)
     amount = validate_amount_basic(amount_str)
     date_out = validate_date_basic(date_str)
@@ -60,22 +69,40 @@ def create_transaction(
         (user_id or "").strip(),
         date_out,
         type_,
-        f"{amount:.2f}",
+        format_cents(amount),
         (category_id or ""),
         description,
     ]
-    append_row(TRANSACTIONS_FILE, row)
+    path = source_path(row[1])
+    if commit == "group" and backend.is_tsv(path):
+        txt_store.buffer_row(path, row, _group_flushed)
+    else:
+        with locks.exclusive(path):
+            token = aggregate_service.begin(user_id)
+            append_row(path, row)
+            file_cache.invalidate(path)
+            aggregate_service.commit(token, [(row[1], type_, category_id, amount, 1)])
 
     return {
         "transaction_id": tid,
         "user_id": user_id,
         "date": date_out,
         "type": type_,
-        "amount": amount,
+        "amount_cents": amount,
         "category_id": category_id,
         "description": description,
     }
 
+def _group_flushed(path: Path, rows: List[List[str]]):
+    # Grup yazılmadan önce (dosya kilidi altında) çağrılır; toplamlar grup başına bir kez güncellenir.
+    token = aggregate_service.begin(rows[0][1])
+    deltas = [(r[1], r[3], r[5] or None, parse_stored_cents(r[4]), 1) for r in rows]
+
+    def done() -> None:
+        file_cache.invalidate(path)
+        aggregate_service.commit(token, deltas)
+    return done
+
 def create_income(user_id: str, amount_str: str, date_str, category_id, description=""):
     return create_transaction(user_id, "income", amount_str, date_str, category_id, description)
 
@@ -88,44 +115,183 @@ def _parse_date_for_sort(date_s: str) -> datetime:
     except Exception:
         return datetime.min
 
-def _parse_amount_no_try(amount_s: str) -> float:
-    s = (amount_s or "").replace(",", ".").strip()
-    if not s:
-        return 0.0
-    parts = s.split(".")
-    if any(not p.isdigit() for p in parts if p != "") or len(parts) > 2:
-        return 0.0
-    try:
-        return float(s)
-    except Exception:
-        return 0.0
+def _parse_row(row: List[str]) -> Dict | None:
+    if not row or row[0].lstrip().startswith("#"):
+        return None
+    if len(row) < 6:
+        return None
+    tid, uid, date_s, t, amount_s, cat_id = row[:6]
+    desc = row[6] if len(row) >= 7 else ""
+    return {
+        "transaction_id": (tid or "").strip(),
+        "user_id": (uid or "").strip(),
+        "date": (date_s or "").strip(),
+        "type": (t or "").strip(),
+        "amount_cents": parse_stored_cents(amount_s),
+        "category_id": ((cat_id or "").strip() or None),
+        "description": (desc or "").strip(),
+    }
 
-def list_transactions(user_id: str, type_=None) -> List[Dict]:
-    items: List[Dict] = []
-    for row in read_rows(TRANSACTIONS_FILE):
-        if not row or row[0].lstrip().startswith("#"):
-            continue
-        if len(row) < 6:
-            continue
-        tid, uid, date_s, t, amount_s, cat_id = row[:6]
-        desc = row[6] if len(row) >= 7 else ""
-        if (uid or "").strip() != (user_id or "").strip():
-            continue
-        if type_ and (t or "").strip() != (type_ or "").strip():
+def _items(path) -> Iterator[Dict]:
+    if backend.is_binary(path):
+        # ikili kayıtlar metne çevrilmeden doğrudan sözlüğe çözülür
+        yield from bin_store.iter_items(path)
+        return
+    for row in backend.iter_rows(path):
+        item = _parse_row(row)
+        if item is not None:
+            yield item
+
+def _group_by_user(items) -> Dict[str, List[Dict]]:
+    # user_id -> dosya sırasındaki kayıtlar
+    by_user: Dict[str, List[Dict]] = {}
+    for item in items:
+        by_user.setdefault(item["user_id"], []).append(item)
+    return by_user
+
+def _parse_chunk(path: str, start: int, end: int, ops) -> Dict[str, List[Dict]]:
+    # chunks.map_ranges tarafından ayrı süreçte çağrılır; aralığın kullanıcı başına kayıtları
+    # Tekrarlanan değerler (kullanıcı, tür, kategori, tarih) tek nesnede paylaştırılır;
+    # pickle aynı nesneyi bir kez yazar, sonuç hem küçülür hem ana süreçte hızlı açılır.
+    by_user: Dict[str, List[Dict]] = {}
+    shared: Dict[str, str] = {}
+    for row in chunks.iter_range_rows(Path(path), start, end, ops):
+        item = _parse_row(row)
+        if item is None:
             continue
-        amt = _parse_amount_no_try(amount_s)
-        category_id = (cat_id or "").strip() or None
-        items.append({
-            "transaction_id": (tid or "").strip(),
-            "user_id": (uid or "").strip(),
-            "date": (date_s or "").strip(),
-            "type": (t or "").strip(),
-            "amount": amt,
-            "category_id": category_id,
-            "description": (desc or "").strip(),
-        })
-    items.sort(key=lambda x: _parse_date_for_sort(x["date"]))
-    return items
+        for key in ("user_id", "type", "category_id", "date"):
+            value = item[key]
+            if value:
+                item[key] = shared.setdefault(value, value)
+        by_user.setdefault(item["user_id"], []).append(item)
+    return by_user
+
+def _parse_parallel(path: Path) -> Dict[str, List[Dict]]:
+    # parçalar dosya sırasıyla birleştirilir; sonuç _group_by_user(_items(path)) ile aynı
+    merged: Dict[str, List[Dict]] = {}
+    for part in chunks.map_ranges(path, _parse_chunk):
+        for uid, rows in part.items():
+            if uid in merged:
+                merged[uid].extend(rows)
+            else:
+                merged[uid] = rows
+    return merged
+
+def _parse_transactions_file(path) -> Dict[str, List[Dict]] | None:
+    if not TRANSACTION_CACHE or backend.indexed(path):
+        # önbelleksiz modda ya da indeksli depoda kullanıcı kayıtları ayrı ayrı okunur (bkz. _user_rows)
+        return None
+    if backend.is_tsv(path) and chunks.use_parallel(path):
+        return _parse_parallel(path)
+    return _group_by_user(_items(path))
+
+def caching() -> bool:
+    return TRANSACTION_CACHE
+
+def sharded() -> bool:
+    return TRANSACTIONS_LAYOUT == "sharded" and backend.is_tsv(TRANSACTIONS_FILE)
+
+def source_path(user_id: str) -> Path:
+    # Kullanıcının kayıtlarının bulunduğu dosya (paylaşılan ya da kullanıcıya ait parça)
+    return shards.shard_path(user_id) if sharded() else TRANSACTIONS_FILE
+
+def source_paths() -> List[Path]:
+    return shards.shard_paths() if sharded() else [TRANSACTIONS_FILE]
+
+def _stream_user(uid: str) -> Iterator[Dict]:
+    for row in backend.iter_rows_for_user(source_path(uid), uid):
+        item = _parse_row(row)
+        if item is not None and item["user_id"] == uid:
+            yield item
+
+def iter_transactions(user_id: str, type_=None) -> Iterator[Dict]:
+    # Sıra gerektirmeyen okuyucular için; önbellek kapalıysa dosyayı okurken süzer.
+    uid = (user_id or "").strip()
+    t = (type_ or "").strip()
+    rows = _user_rows(uid) if TRANSACTION_CACHE else _stream_user(uid)
+    for x in rows:
+        if not t or x["type"] == t:
+            yield x
+
+def iter_source(path: Path) -> Iterator[Dict]:
+    if TRANSACTION_CACHE and not backend.indexed(path):
+        for rows in _by_user(path).values():
+            yield from rows
+        return
+    yield from _items(path)
+
+def iter_all_transactions() -> Iterator[Dict]:
+    for path in source_paths():
+        yield from iter_source(path)
+
+def _by_user(path: Path) -> Dict[str, List[Dict]]:
+    if not TRANSACTION_CACHE:
+        return _group_by_user(_items(path))
+    return file_cache.derive(
+        path,
+        "by_user",
+        _parse_transactions_file,
+        lambda by_user: by_user if by_user is not None else _group_by_user(_items(path)),
+    )
+
+def _all_by_user() -> Dict[str, List[Dict]]:
+    if not sharded():
+        return _by_user(TRANSACTIONS_FILE)
+    merged: Dict[str, List[Dict]] = {}
+    for path in shards.shard_paths():
+        merged.update(_by_user(path))
+    return merged
+
+def _user_rows(user_id: str) -> List[Dict]:
+    uid = (user_id or "").strip()
+    if not TRANSACTION_CACHE:
+        return list(_stream_user(uid))
+    path = source_path(uid)
+    if backend.indexed(path):
+        return file_cache.derive(
+            path,
+            ("user", uid),
+            _parse_transactions_file,
+            lambda _: list(_stream_user(uid)),
+        )
+    return _by_user(path).get(uid, [])
+
+def _sort_by_date(rows: List[Dict]) -> List[Dict]:
+    return sorted(rows, key=lambda x: _parse_date_for_sort(x["date"]))
+
+def _user_rows_sorted(user_id: str) -> List[Dict]:
+    uid = (user_id or "").strip()
+    if not TRANSACTION_CACHE:
+        return _sort_by_date(_user_rows(uid))
+    return file_cache.derive(
+        source_path(uid),
+        ("sorted", uid),
+        _parse_transactions_file,
+        lambda _: _sort_by_date(_user_rows(uid)),
+    )
+
+def user_view(user_id: str, name: str, build):
+    # Kullanıcının tarih sıralı kayıtlarından türetilen yapı; dosya değişene kadar saklanır.
+    uid = (user_id or "").strip()
+    if not TRANSACTION_CACHE:
+        return build(_user_rows_sorted(uid))
+    return file_cache.derive(
+        source_path(uid),
+        (name, uid),
+        _parse_transactions_file,
+        lambda _: build(_user_rows_sorted(uid)),
+    )
+
+def table_view(name: str, build):
+    # Tüm kullanıcıların kayıtlarından türetilen yapı (ör. sütunlu tablo).
+    # Parçalı düzende tek bir imza olmadığı için saklanmaz.
+    if not TRANSACTION_CACHE or sharded():
+        return build(_all_by_user())
+    return file_cache.derive(TRANSACTIONS_FILE, name, _parse_transactions_file, lambda _: build(_all_by_user()))
+
+def list_transactions(user_id: str, type_=None) -> List[Dict]:
+    t = (type_ or "").strip()
+    return [dict(x) for x in _user_rows_sorted(user_id) if not t or x["type"] == t]
 
 def list_incomes(user_id: str) -> List[Dict]:
     return list_transactions(user_id, "income")
@@ -133,84 +299,185 @@ def list_incomes(user_id: str) -> List[Dict]:
 def list_expenses(user_id: str) -> List[Dict]:
     return list_transactions(user_id, "expense")
 
+def _row_fields(item: Dict) -> List[str]:
+    return [
+        item["transaction_id"],
+        item["user_id"],
+        item["date"],
+        item["type"],
+        format_cents(item["amount_cents"]),
+        (item["category_id"] or ""),
+        item["description"],
+    ]
+
+def _delta(item: Dict, sign: int):
+    return (item["user_id"], item["type"], item["category_id"], sign * item["amount_cents"], sign)
+
+def _find(user_id: str, txn_id: str) -> Dict | None:
+    return next((x for x in _user_rows(user_id) if x["transaction_id"] == txn_id), None)
+
 def delete_transaction_by_id(txn_id: str, user_id: str) -> None:
-    rows = read_rows(TRANSACTIONS_FILE)
-    new_rows = []
-    deleted = False
-    for row in rows:
-        if not row or row[0].lstrip().startswith("#"):
-            new_rows.append(row)
-            continue
-        if len(row) >= 2 and (row[0] or "").strip() == (txn_id or "").strip() and (row[1] or "").strip() == (user_id or "").strip():
-            deleted = True
-            continue
-        new_rows.append(row)
-    if not deleted:
-        raise ValueError("Kayıt bulunamadı.")
-    with open(TRANSACTIONS_FILE, "w", encoding="utf-8") as f:
-        for r in new_rows:
-            f.write("\t".join(r) + "\n")
-
-def _materialize_user_type_rows_with_pointers(user_id: str, type_: str):
-    rows = read_rows(TRANSACTIONS_FILE)
-    pointers = []
-    for i, row in enumerate(rows):
-        if not row or row[0].lstrip().startswith("#"):
-            continue
-        if len(row) < 6:
-            continue
-        tid, uid, date_s, t, amount_s, cat_id = row[:6]
-        desc = row[6] if len(row) >= 7 else ""
-        if (uid or "").strip() != (user_id or "").strip():
-            continue
-        if (t or "").strip() != (type_ or "").strip():
-            continue
-        amt = _parse_amount_no_try(amount_s)
-        parsed = {
-            "transaction_id": (tid or "").strip(),
-            "user_id": (uid or "").strip(),
-            "date": (date_s or "").strip(),
-            "type": (t or "").strip(),
-            "amount": amt,
-            "category_id": ((cat_id or "").strip() or None),
-            "description": (desc or "").strip(),
-        }
-        pointers.append((i, parsed))
-    return rows, pointers
+    target = (txn_id or "").strip()
+    path = source_path(user_id)
+    with locks.exclusive(path):
+        item = _find(user_id, target)
+        if item is None:
+            raise ValueError("Kayıt bulunamadı.")
+        token = aggregate_service.begin(user_id)
+        delete_row(path, target)
+        file_cache.invalidate(path)
+        aggregate_service.commit(token, [_delta(item, -1)])
 
 def enumerate_transactions_for_edit(user_id: str, type_: str) -> List[Dict]:
-    _, pointers = _materialize_user_type_rows_with_pointers(user_id, type_)
+    t = (type_ or "").strip()
+    items = [x for x in _user_rows(user_id) if x["type"] == t]
+    names = category_service.category_name_map(user_id)
     out: List[Dict] = []
-    for idx, (_, item) in enumerate(pointers, start=1):
+    for idx, item in enumerate(items, start=1):
         out.append({
             "index": idx,
             "transaction_id": item["transaction_id"],
             "date": item["date"],
-            "amount": item["amount"],
+            "amount_cents": item["amount_cents"],
             "category_id": item["category_id"],
-            "category_name": get_category_name_by_id(user_id, item["category_id"]) or "(yok)",
+            "category_name": (names.get(item["category_id"]) if item["category_id"] else None) or "(yok)",
             "description": item["description"],
         })
     return out
 
+# Sayfalı listeleme: kayıtlar (tarih, transaction_id) anahtarına göre sıralanır; imleç
+# sayfanın son kaydının anahtarıdır ("gün:id"), sonraki sayfa bu anahtardan sonra başlar.
+# Araya kayıt eklense ya da silinse de sayfalar kaymaz. Yalnızca gösterilen sayfanın
+# satırları kurulur ve kategori adları çözülür.
+PageKey = Tuple[int, str]
+
+
+def _page_key(item: Dict) -> PageKey:
+    return (date_ordinal(item["date"]), item["transaction_id"])
+
+
+def _parse_cursor(cursor: Optional[str]) -> Optional[PageKey]:
+    if not cursor:
+        return None
+    day, sep, tid = cursor.partition(":")
+    if sep and tid:
+        try:
+            return (int(day), tid)
+        except ValueError:
+            pass
+    raise ValueError("Geçersiz sayfa imleci.")
+
+
+def _keyed_by_type(user_id: str, type_: str) -> Tuple[List[PageKey], List[Dict]]:
+    # türün kayıtları anahtar sırasıyla; önbellekte dosya değişene kadar saklanır
+    def build(rows: List[Dict]):
+        items = sorted((x for x in rows if x["type"] == type_), key=_page_key)
+        return [_page_key(x) for x in items], items
+
+    return user_view(user_id, ("paged", type_), build)
+
+
+def _select_page(user_id: str, t: str, after: Optional[PageKey], limit: int, newest_first: bool):
+    # -> (sayfa kayıtları, imleçten önce kalan kayıt sayısı, toplam, devamı var mı)
+    if TRANSACTION_CACHE:
+        keys, items = _keyed_by_type(user_id, t)
+        total = len(keys)
+        if newest_first:
+            end = bisect_left(keys, after) if after else total
+            start = max(end - limit, 0)
+            return items[start:end][::-1], total - end, total, start > 0
+        start = bisect_right(keys, after) if after else 0
+        return items[start:start + limit], start, total, start + limit < total
+
+    # önbelleksiz: dosya akarken yalnızca limit+1 kayıt yığında tutulur
+    counts = {"total": 0, "before": 0}
+
+    def candidates() -> Iterator[Tuple[PageKey, Dict]]:
+        for x in iter_transactions(user_id, t):
+            key = _page_key(x)
+            counts["total"] += 1
+            if after is not None and (key >= after if newest_first else key <= after):
+                counts["before"] += 1
+                continue
+            yield key, x
+
+    pick = heapq.nlargest if newest_first else heapq.nsmallest
+    chosen = pick(limit + 1, candidates(), key=lambda kx: kx[0])
+    return [x for _, x in chosen[:limit]], counts["before"], counts["total"], len(chosen) > limit
+
+
+def list_transactions_page(
+    user_id: str,
+    type_: Optional[str],
+    cursor: Optional[str] = None,
+    limit: int = PAGE_SIZE,
+    newest_first: bool = True,
+) -> Dict:
+    # -> {"rows": [...], "next_cursor": str | None, "total": int}
+    # rows, enumerate_transactions_for_edit ile aynı biçimdedir; "index" baştan sıradır.
+    t = validate_type_basic(type_)
+    if limit < 1:
+        raise ValueError("Sayfa boyutu 0'dan büyük olmalı.")
+    uid = (user_id or "").strip()
+    page, before, total, more = _select_page(uid, t, _parse_cursor(cursor), limit, newest_first)
+    names = category_service.category_name_map(uid)
+    rows = [
+        {
+            "index": before + i,
+            "transaction_id": item["transaction_id"],
+            "date": item["date"],
+            "amount_cents": item["amount_cents"],
+            "category_id": item["category_id"],
+            "category_name": (names.get(item["category_id"]) if item["category_id"] else None) or "(yok)",
+            "description": item["description"],
+        }
+        for i, item in enumerate(page, start=1)
+    ]
+    next_cursor = None
+    if more and page:
+        day, tid = _page_key(page[-1])
+        next_cursor = f"{day}:{tid}"
+    return {"rows": rows, "next_cursor": next_cursor, "total": total}
+
+EDITABLE_FIELDS = {"date", "amount", "category_id", "description"}
+
+def update_transaction(user_id: str, txn_id: str, changes: Dict) -> Dict:
+    # Tüm alanlar önce doğrulanır; biri hatalıysa hiçbir şey yazılmaz.
+    unknown = set(changes) - EDITABLE_FIELDS
+    if unknown:
+        raise ValueError("Geçersiz alan adı.")
+    target = (txn_id or "").strip()
+    current = _find(user_id, target)
+    if current is None:
+        raise ValueError("Kayıt bulunamadı.")
+    item = dict(current)
+    if "date" in changes:
+        item["date"] = validate_date_basic(changes["date"])
+    if "amount" in changes:
+        item["amount_cents"] = validate_amount_basic(changes["amount"] or "")
+    if "category_id" in changes:
+        cid = validate_category_id_basic(changes["category_id"])
+        _ensure_category_belongs_to_user(user_id, cid, item["type"])
+        item["category_id"] = cid
+    if "description" in changes:
+        item["description"] = validate_description_basic(changes["description"] or "")
+    if item != current:
+        # Kategori kontrolü kilit dışında yapıldı; kayıt bu arada değiştiyse yazılmaz.
+        path = source_path(user_id)
+        with locks.exclusive(path):
+            if _find(user_id, target) != current:
+                raise ValueError("Kayıt başka bir oturumda değiştirildi, tekrar deneyin.")
+            token = aggregate_service.begin(user_id)
+            update_row(path, _row_fields(item))
+            file_cache.invalidate(path)
+            aggregate_service.commit(token, [_delta(current, -1), _delta(item, 1)])
+    return item
+
 def update_transaction_by_index(user_id: str, type_: str, index: int, field: str, new_value) -> None:
-    if field not in {"date", "amount", "category_id", "description"}:
+    if field not in EDITABLE_FIELDS:
         raise ValueError("Geçersiz alan adı.")
-    rows, pointers = _materialize_user_type_rows_with_pointers(user_id, type_)
-    if index < 1 or index > len(pointers):
+    t = (type_ or "").strip()
+    items = [x for x in _user_rows(user_id) if x["type"] == t]
+    if index < 1 or index > len(items):
         raise ValueError("Geçersiz index.")
-    row_pointer, _current = pointers[index - 1]
-    row = rows[row_pointer]
-    if field == "date":
-        row[2] = validate_date_basic(new_value)
-    elif field == "amount":
-        row[4] = f"{validate_amount_basic(new_value or ''):.2f}"
-    elif field == "category_id":
-        cid = validate_category_id_basic(new_value)
-        _ensure_category_belongs_to_user(user_id, cid, type_)
-        row[5] = cid or ""
-    elif field == "description":
-        row[6] = validate_description_basic(new_value or "")
-    with open(TRANSACTIONS_FILE, "w", encoding="utf-8") as f:
-        for r in rows:
-            f.write("\t".join(r) + "\n")
+    update_transaction(user_id, items[index - 1]["transaction_id"], {field: new_value})
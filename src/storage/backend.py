@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Iterator
+
+from src.core.config import STORAGE_BACKEND, TRANSACTIONS_FILE, USER_OFFSET_INDEX
+from src.storage import bin_store, mmap_store, sqlite_store, txt_store
+
+# Servislerin kullandığı depolama arayüzü. STORAGE_BACKEND = "tsv" (data/*.txt),
+# "sqlite" ya da "binary" (yalnızca transactions, bkz. bin_store); diğer dosyalar
+# (ör. aggregates.txt) TSV'de kalır.
+
+
+def _store(path: Path):
+    if STORAGE_BACKEND == "sqlite" and sqlite_store.table_for(path):
+        return sqlite_store
+    if STORAGE_BACKEND == "binary" and path == TRANSACTIONS_FILE:
+        return bin_store
+    return txt_store
+
+
+def indexed(path: Path) -> bool:
+    return _store(path) is sqlite_store
+
+
+def is_tsv(path: Path) -> bool:
+    return _store(path) is txt_store
+
+
+def is_binary(path: Path) -> bool:
+    return _store(path) is bin_store
+
+
+def signature(path: Path):
+    return _store(path).signature(path)
+
+
+def read_rows(path: Path) -> list[list[str]]:
+    return _store(path).read_rows(path)
+
+
+def iter_rows(path: Path) -> Iterator[list[str]]:
+    return _store(path).iter_rows(path)
+
+
+def append_row(path: Path, fields: list[str]) -> None:
+    _store(path).append_row(path, fields)
+
+
+def append_rows(path: Path, rows: list[list[str]]) -> None:
+    _store(path).append_rows(path, rows)
+
+
+def update_row(path: Path, fields: list[str]) -> None:
+    _store(path).update_row(path, fields)
+
+
+def delete_row(path: Path, row_id: str) -> None:
+    _store(path).delete_row(path, row_id)
+
+
+def write_rows(path: Path, rows: list[list[str]]) -> None:
+    _store(path).write_rows(path, rows)
+
+
+def compact(path: Path) -> None:
+    _store(path).compact(path)
+
+
+def iter_rows_for_user(path: Path, user_id: str) -> Iterator[list[str]]:
+    # categories/transactions: user_id ikinci sütun
+    if indexed(path):
+        return sqlite_store.iter_rows_for_user(path, user_id)
+    if is_binary(path):
+        return bin_store.iter_rows_for_user(path, user_id)
+    if USER_OFFSET_INDEX and path == TRANSACTIONS_FILE:
+        return mmap_store.iter_rows_for_user(path, user_id)
+    return (r for r in txt_store.iter_rows(path) if len(r) > 1 and r[1].strip() == user_id)
+
+
+def rows_for_user(path: Path, user_id: str) -> list[list[str]]:
+    return list(iter_rows_for_user(path, user_id))
@@ -0,0 +1,370 @@
+import os
+import struct
+import sys
+import uuid
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from src.core.config import TRANSACTIONS_FILE
+from src.core.money import format_cents, parse_stored_cents
+from src.core.validation import date_ordinal
+from src.storage import locks, txt_store
+
+# transactions için sabit genişlikli ikili kayıt biçimi (STORAGE_BACKEND = "binary"):
+#   <dosya>.bin : MAGIC + kayıtlar
+#   <dosya>.heap: açıklama baytları (UTF-8), kayıt ofset/uzunluk ile gösterir
+# Kayıt: bayrak, transaction_id, user_id, category_id (16 bayt UUID; kategori yoksa sıfır),
+# tarih (gün sayısı, geçersizse 0), tür (0: bilinmeyen), tutar (int64 kuruş),
+# açıklama ofseti ve uzunluğu.
+# Kayıtlar sabit genişlikte olduğundan güncelleme/silme yerinde yazılır; compact()
+# silinmiş kayıtları ve kullanılmayan açıklama baytlarını atar.
+
+MAGIC = b"EXPTXN1\n"
+RECORD = struct.Struct("<B16s16s16sIBqII")
+FLAG_DELETED = 1
+TYPE_CODES = {"income": 1, "expense": 2}
+TYPE_NAMES = {v: k for k, v in TYPE_CODES.items()}
+
+_F_FLAG, _F_TID, _F_UID, _F_CID, _F_DAY, _F_TYPE, _F_CENTS, _F_OFF, _F_LEN = range(9)
+_NO_ID = bytes(16)
+_MIN_CENTS, _MAX_CENTS = -(1 << 63), (1 << 63) - 1  # q alanı
+_MAX_HEAP = (1 << 32) - 1  # I alanı (açıklama ofseti/uzunluğu)
+_MIN_DAY = date.min.toordinal()
+
+# dosya -> ((inode, boyut), {transaction_id baytları: kayıt sırası})
+_slots: dict[Path, tuple[tuple[int, int], dict[bytes, int]]] = {}
+
+
+def data_path(path: Path) -> Path:
+    return path.with_suffix(".bin")
+
+
+def heap_path(path: Path) -> Path:
+    return path.with_suffix(".heap")
+
+
+def signature(path: Path):
+    return (txt_store._stat_signature(data_path(path)), txt_store._stat_signature(heap_path(path)))
+
+
+def _id_bytes(s: str) -> bytes:
+    s = (s or "").strip()
+    return uuid.UUID(s).bytes if s else _NO_ID
+
+
+def _id_str(b: bytes) -> str:
+    # str(uuid.UUID(bytes=b)) ile aynı, daha hızlı
+    if b == _NO_ID:
+        return ""
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# user/category id'leri çok tekrar eder; çözülmüş halleri saklanır
+_shared_id_str = lru_cache(maxsize=4096)(_id_str)
+
+
+@lru_cache(maxsize=None)
+def _date_str(day: int) -> str:
+    return date.fromordinal(day).strftime("%d-%m-%Y") if day else ""
+
+
+def _encode(fields: list[str], desc_off: int) -> tuple[bytes, bytes]:
+    # TSV satırı -> (kayıt, açıklama baytları); dönüştürülemeyen değerde ValueError
+    fields = list(fields) + [""] * (7 - len(fields))
+    tid, uid, date_s, type_, amount, cid, desc = fields[:7]
+    # geçersiz tarih/tür TSV'deki gibi okunabilir kalır: 0 saklanır, boş dize olarak döner
+    day = date_ordinal(date_s)
+    day = 0 if day == _MIN_DAY else day
+    code = TYPE_CODES.get(type_.strip(), 0)
+    try:
+        ids = (_id_bytes(tid), _id_bytes(uid), _id_bytes(cid))
+    except ValueError:
+        raise ValueError("ID geçersiz.")
+    if ids[0] == _NO_ID or ids[1] == _NO_ID:
+        raise ValueError("ID geçersiz.")
+    cents = parse_stored_cents(amount)
+    if not _MIN_CENTS <= cents <= _MAX_CENTS:
+        raise ValueError("Tutar Geçersiz.")
+    raw = desc.encode(txt_store.ENC)
+    if raw and desc_off + len(raw) > _MAX_HEAP:
+        raise ValueError("Açıklama dosyası sınırına ulaşıldı.")
+    rec = RECORD.pack(0, *ids, day, code, cents, desc_off if raw else 0, len(raw))
+    return rec, raw
+
+
+def _decode(rec: tuple, heap: bytes) -> list[str]:
+    desc = heap[rec[_F_OFF]:rec[_F_OFF] + rec[_F_LEN]].decode(txt_store.ENC) if rec[_F_LEN] else ""
+    return [
+        _id_str(rec[_F_TID]),
+        _shared_id_str(rec[_F_UID]),
+        _date_str(rec[_F_DAY]),
+        TYPE_NAMES.get(rec[_F_TYPE], ""),
+        format_cents(rec[_F_CENTS]),
+        _shared_id_str(rec[_F_CID]),
+        desc,
+    ]
+
+
+def _read(path: Path) -> tuple[bytes, bytes]:
+    # kayıtlar ve heap aynı kilit altında okunur (yazıcı ikisini birlikte değiştirir)
+    with locks.shared(path):
+        try:
+            data = data_path(path).read_bytes()
+        except FileNotFoundError:
+            return b"", b""
+        heap = heap_path(path).read_bytes() if heap_path(path).exists() else b""
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{data_path(path)} ikili işlem dosyası değil.")
+    return data[len(MAGIC):], heap
+
+
+def _iter_records(path: Path) -> Iterator[tuple[tuple, bytes]]:
+    body, heap = _read(path)
+    usable = len(body) - len(body) % RECORD.size
+    for rec in RECORD.iter_unpack(body[:usable]):
+        if not rec[_F_FLAG] & FLAG_DELETED:
+            yield rec, heap
+
+
+def iter_rows(path: Path) -> Iterator[list[str]]:
+    for rec, heap in _iter_records(path):
+        yield _decode(rec, heap)
+
+
+def read_rows(path: Path) -> list[list[str]]:
+    return list(iter_rows(path))
+
+
+def iter_items(path: Path) -> Iterator[dict]:
+    # Servis kayıt sözlüğü (bkz. transaction_service._parse_row); tutar metne
+    # çevrilmeden doğrudan kuruş olarak gelir.
+    for rec, heap in _iter_records(path):
+        n = rec[_F_LEN]
+        yield {
+            "transaction_id": _id_str(rec[_F_TID]),
+            "user_id": _shared_id_str(rec[_F_UID]),
+            "date": _date_str(rec[_F_DAY]),
+            "type": TYPE_NAMES.get(rec[_F_TYPE], ""),
+            "amount_cents": rec[_F_CENTS],
+            "category_id": _shared_id_str(rec[_F_CID]) or None,
+            "description": heap[rec[_F_OFF]:rec[_F_OFF] + n].decode(txt_store.ENC).strip() if n else "",
+        }
+
+
+def iter_rows_for_user(path: Path, user_id: str) -> Iterator[list[str]]:
+    # kullanıcı ham baytla karşılaştırılır; yalnızca eşleşen kayıtlar çözülür
+    try:
+        key = _id_bytes(user_id)
+    except ValueError:
+        return
+    for rec, heap in _iter_records(path):
+        if rec[_F_UID] == key:
+            yield _decode(rec, heap)
+
+
+def _slot_index(path: Path) -> dict[bytes, int]:
+    p = data_path(path)
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        return {}
+    key = (st.st_ino, st.st_size)
+    cached = _slots.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    body, _ = _read(path)
+    usable = len(body) - len(body) % RECORD.size
+    slots = {
+        rec[_F_TID]: i
+        for i, rec in enumerate(RECORD.iter_unpack(body[:usable]))
+        if not rec[_F_FLAG] & FLAG_DELETED
+    }
+    _slots[path] = (key, slots)
+    return slots
+
+
+def _remember(path: Path, slots: dict[bytes, int]) -> None:
+    st = data_path(path).stat()
+    _slots[path] = ((st.st_ino, st.st_size), slots)
+
+
+def _heap_size(path: Path) -> int:
+    try:
+        return heap_path(path).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _heap_bytes(path: Path, off: int, length: int) -> bytes:
+    if not length:
+        return b""
+    with heap_path(path).open("rb") as f:
+        f.seek(off)
+        return f.read(length)
+
+
+def _append_heap(path: Path, raw: bytes) -> None:
+    if raw:
+        with heap_path(path).open("ab") as f:
+            f.write(raw)
+
+
+def append_row(path: Path, fields: list[str]) -> None:
+    append_rows(path, [fields])
+
+
+def append_rows(path: Path, rows: list[list[str]]) -> None:
+    with locks.exclusive(path):
+        _append_rows(path, rows)
+
+
+def _append_rows(path: Path, rows: list[list[str]]) -> None:
+    slots = _slot_index(path)
+    p = data_path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    off = _heap_size(path)
+    recs: list[bytes] = []
+    heap: list[bytes] = []
+    for fields in rows:
+        rec, raw = _encode(fields, off)
+        recs.append(rec)
+        heap.append(raw)
+        off += len(raw)
+    _append_heap(path, b"".join(heap))
+    new = not p.exists() or p.stat().st_size == 0
+    with p.open("ab") as f:
+        if new:
+            f.write(MAGIC)
+        start = (f.tell() - len(MAGIC)) // RECORD.size
+        f.write(b"".join(recs))
+    for i, rec in enumerate(recs):
+        slots[rec[1:17]] = start + i
+    _remember(path, slots)
+
+
+def _write_at(path: Path, slot: int, rec: bytes) -> None:
+    with data_path(path).open("r+b") as f:
+        f.seek(len(MAGIC) + slot * RECORD.size)
+        f.write(rec)
+
+
+def update_row(path: Path, fields: list[str]) -> None:
+    with locks.exclusive(path):
+        _update_row(path, fields)
+
+
+def _update_row(path: Path, fields: list[str]) -> None:
+    # Kayıt yerinde yeniden yazılır; açıklama değiştiyse yeni baytlar heap sonuna eklenir.
+    slots = _slot_index(path)
+    slot = slots.get(_id_bytes(fields[0]))
+    if slot is None:
+        return
+    with data_path(path).open("rb") as f:
+        f.seek(len(MAGIC) + slot * RECORD.size)
+        old = RECORD.unpack(f.read(RECORD.size))
+    rec, raw = _encode(fields, _heap_size(path))
+    new = RECORD.unpack(rec)
+    if raw == _heap_bytes(path, old[_F_OFF], old[_F_LEN]):
+        rec = RECORD.pack(*new[:_F_OFF], old[_F_OFF], old[_F_LEN])
+    else:
+        _append_heap(path, raw)
+    _write_at(path, slot, rec)
+    _remember(path, slots)
+
+
+def delete_row(path: Path, row_id: str) -> None:
+    with locks.exclusive(path):
+        _delete_row(path, row_id)
+
+
+def _delete_row(path: Path, row_id: str) -> None:
+    slots = _slot_index(path)
+    slot = slots.pop(_id_bytes(row_id), None)
+    if slot is None:
+        return
+    with data_path(path).open("r+b") as f:
+        f.seek(len(MAGIC) + slot * RECORD.size)
+        f.write(bytes([FLAG_DELETED]))
+    _remember(path, slots)
+
+
+def write_rows(path: Path, rows) -> dict[str, int]:
+    # Geçici dosyalara yazıp yerine taşır; dönüştürülemeyen satırlar atlanır ve sayılır.
+    p, h = data_path(path), heap_path(path)
+    tmp_p, tmp_h = p.with_name(p.name + ".tmp"), h.with_name(h.name + ".tmp")
+    p.parent.mkdir(parents=True, exist_ok=True)
+    counts = {"rows": 0, "skipped": 0}
+    off = 0
+    with locks.exclusive(path):
+        try:
+            with tmp_p.open("wb") as fp, tmp_h.open("wb") as fh:
+                fp.write(MAGIC)
+                for fields in rows:
+                    try:
+                        rec, raw = _encode(fields, off)
+                    except ValueError:
+                        counts["skipped"] += 1
+                        continue
+                    fp.write(rec)
+                    fh.write(raw)
+                    off += len(raw)
+                    counts["rows"] += 1
+            os.replace(tmp_h, h)
+            os.replace(tmp_p, p)
+        finally:
+            tmp_p.unlink(missing_ok=True)
+            tmp_h.unlink(missing_ok=True)
+        _slots.pop(path, None)
+    return counts
+
+
+def _reclaimable(path: Path) -> bool:
+    # silinmiş kayıt, yarım kalmış kayıt ya da kullanılmayan açıklama baytı var mı
+    body, heap = _read(path)
+    if len(body) % RECORD.size:
+        return True
+    live_bytes = 0
+    for rec in RECORD.iter_unpack(body):
+        if rec[_F_FLAG] & FLAG_DELETED:
+            return True
+        live_bytes += rec[_F_LEN]
+    return live_bytes != len(heap)
+
+
+def compact(path: Path) -> None:
+    # yalnızca geri kazanılacak yer varsa yeniden yazılır
+    if not data_path(path).exists() or not _reclaimable(path):
+        return
+    write_rows(path, iter_rows(path))
+
+
+def import_tsv(path: Path = TRANSACTIONS_FILE) -> dict[str, int]:
+    # TSV dosyasını (günlük uygulanmış haliyle) ikili biçime çevirir; TSV'ye dokunmaz.
+    return write_rows(path, txt_store.iter_rows(path))
+
+
+def export_tsv(path: Path = TRANSACTIONS_FILE) -> int:
+    rows = read_rows(path)
+    txt_store.write_rows(path, rows)
+    return len(rows)
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv == ["import"]:
+        c = import_tsv()
+        print(f"{c['rows']} kayıt aktarıldı -> {data_path(TRANSACTIONS_FILE)}")
+        if c["skipped"]:
+            print(f"{c['skipped']} satır geçersiz alan nedeniyle atlandı.")
+    elif argv == ["export"]:
+        n = export_tsv()
+        print(f"{n} kayıt yazıldı -> {TRANSACTIONS_FILE}")
+    else:
+        print("Kullanım: python -m src.storage.bin_store import|export")
+
+
+if __name__ == "__main__":
+    main()
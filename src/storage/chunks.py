@@ -0,0 +1,76 @@
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from src.core.config import PARSE_CHUNK_BYTES, PARSE_PARALLEL_MIN_BYTES, PARSE_WORKERS
+from src.storage import locks, txt_store
+
+# Büyük TSV dosyalarının süreçler arasında paralel ayrıştırılması. Dosya satır sonuna
+# hizalı bayt aralıklarına bölünür; her aralık bir süreçte okunup ayrıştırılır, sonuçlar
+# dosya sırasıyla döner. Satırlar txt_store.iter_rows ile aynı kurallarla bölünür
+# (aynı satır sonu işleme, boş/yorum satırları atlanır, günlük uygulanır).
+# Süreçler fork ile değil forkserver/spawn ile başlatılır: üst süreçte iş parçacıkları
+# (HTTP havuzu, toplu yazma zamanlayıcısı) tutulan bir kilitle birlikte kopyalanmaz ve
+# çocuklar ölçüm (instrument) sarmalayıcıları olmadan temiz modüllerle çalışır; bu
+# yüzden çocuklardaki okumalar ölçüme yansımaz. Yalnızca ana iş parçacığından kullanılır.
+
+
+def worker_count() -> int:
+    return PARSE_WORKERS or os.cpu_count() or 1
+
+
+def use_parallel(path: Path) -> bool:
+    if worker_count() < 2 or threading.current_thread() is not threading.main_thread():
+        return False
+    try:
+        return path.stat().st_size >= PARSE_PARALLEL_MIN_BYTES
+    except FileNotFoundError:
+        return False
+
+
+def ranges(path: Path, chunk_size: int | None = None) -> list[tuple[int, int]]:
+    # [başlangıç, bitiş) aralıkları; her bitiş bir "\n"den hemen sonradır
+    chunk_size = chunk_size or PARSE_CHUNK_BYTES
+    size = path.stat().st_size
+    out: list[tuple[int, int]] = []
+    with path.open("rb") as f:
+        start = 0
+        while start < size:
+            end = min(start + max(chunk_size, 1), size)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            out.append((start, end))
+            start = end
+    return out
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def iter_range_rows(path: Path, start: int, end: int, ops: dict[str, list[str] | None]) -> Iterator[list[str]]:
+    with Path(path).open("rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = io.StringIO(data.decode(txt_store.ENC), newline="")
+    return txt_store.apply_journal(txt_store.split_lines(lines), ops)
+
+
+def map_ranges(path: Path, fn: Callable[..., Any], *args: Any) -> list[Any]:
+    # fn(yol, başlangıç, bitiş, günlük, *args) her aralık için ayrı süreçte çağrılır;
+    # fn modül düzeyinde tanımlı olmalı (süreçlere pickle ile gönderilir).
+    txt_store.flush(path)
+    with locks.shared(path):
+        ops = txt_store.read_journal(path)
+        spans = ranges(path)
+        workers = min(worker_count(), len(spans) or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as ex:
+            futures = [ex.submit(fn, str(path), start, end, ops, *args) for start, end in spans]
+            return [f.result() for f in futures]
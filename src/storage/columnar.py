@@ -0,0 +1,71 @@
+from typing import Callable, Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsiyonel; yoksa raporlar saf Python yolunda kalır
+    np = None
+
+TYPE_CODES = {"income": 1, "expense": 2}
+
+
+def available() -> bool:
+    return np is not None
+
+
+def build_table(
+    by_user: Dict[str, List[Dict]],
+    ordinal: Callable[[str], int],
+    cents: Callable[[Dict], int],
+) -> Dict:
+    # Tüm kayıtlar sütunlar halinde; her kullanıcının satırları tarih sıralı ve bitişik.
+    users: Dict[str, tuple] = {}
+    cat_codes: Dict[str, int] = {}
+    cat_ids: List = [None]
+    user_col: List[int] = []
+    ord_col: List[int] = []
+    type_col: List[int] = []
+    cat_col: List[int] = []
+    cents_col: List[int] = []
+    for code, (uid, rows) in enumerate(by_user.items()):
+        keyed = sorted(((ordinal(r["date"]), i) for i, r in enumerate(rows)))
+        lo = len(ord_col)
+        for o, i in keyed:
+            r = rows[i]
+            cid = r.get("category_id")
+            if cid and cid not in cat_codes:
+                cat_codes[cid] = len(cat_ids)
+                cat_ids.append(cid)
+            user_col.append(code)
+            ord_col.append(o)
+            type_col.append(TYPE_CODES.get(r.get("type"), 0))
+            cat_col.append(cat_codes[cid] if cid else 0)
+            cents_col.append(cents(r))
+        users[uid] = (lo, len(ord_col))
+    ords = np.array(ord_col, dtype=np.int64)
+    return {
+        "users": users,
+        "cat_ids": cat_ids,
+        "user": np.array(user_col, dtype=np.int32),
+        "ord": ords,
+        "type": np.array(type_col, dtype=np.int8),
+        "cat": np.array(cat_col, dtype=np.int32),
+        "cents": np.array(cents_col, dtype=np.int64),
+    }
+
+
+def user_slice(table: Dict, user_id: str, start: int | None = None, end: int | None = None) -> slice:
+    lo, hi = table["users"].get(user_id, (0, 0))
+    ords = table["ord"][lo:hi]
+    a = int(np.searchsorted(ords, start, side="left")) if start is not None else 0
+    b = int(np.searchsorted(ords, end, side="right")) if end is not None else hi - lo
+    return slice(lo + a, lo + max(a, b))
+
+
+def group_sum(keys, values):
+    # Anahtar başına tam sayı toplam; (anahtarlar, toplamlar, ilk görülme sırası)
+    if len(keys) == 0:
+        return keys, values, keys
+    uniq, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    sums = np.zeros(len(uniq), dtype=np.int64)
+    np.add.at(sums, inverse, values)
+    return uniq, sums, first
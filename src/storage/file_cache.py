@@ -0,0 +1,61 @@
+from pathlib import Path
+from typing import Any, Callable
+
+from src.storage import backend
+
+# Dosya başına ayrıştırılmış içerik önbelleği.
+# Depolamanın imzası (TSV'de dosya ve günlüğünün mtime/size/inode'u, sqlite'ta tablo sürümü)
+# değişince ya da servis kendi yazdığında
+# invalidate() çağrılınca kayıt düşer; aksi halde tekrar okuma disk I/O yapmaz.
+
+_entries: dict[Path, dict] = {}
+
+
+def signature(path: Path):
+    return backend.signature(path)
+
+
+def _entry(path: Path) -> dict | None:
+    entry = _entries.get(path)
+    if entry is None:
+        return None
+    if entry["sig"] != signature(path):
+        _entries.pop(path, None)
+        return None
+    return entry
+
+
+def _load_entry(path: Path, parse: Callable[[Path], Any]) -> dict:
+    # Kayıt nesnesi bir kez kurulduktan sonra değişmez (yalnızca derived'a eklenir);
+    # başka bir iş parçacığı araya invalidate() soksa da elimizdeki kayıt tutarlı kalır.
+    entry = _entry(path)
+    if entry is None:
+        sig = signature(path)
+        entry = {"sig": sig, "value": parse(path), "derived": {}}
+        _entries[path] = entry
+    return entry
+
+
+def load(path: Path, parse: Callable[[Path], Any]) -> Any:
+    return _load_entry(path, parse)["value"]
+
+
+def derive(path: Path, key, parse: Callable[[Path], Any], build: Callable[[Any], Any]) -> Any:
+    entry = _load_entry(path, parse)
+    derived = entry["derived"]
+    if key not in derived:
+        derived[key] = build(entry["value"])
+    return derived[key]
+
+
+def put(path: Path, value: Any) -> None:
+    # Servis yazdığı içeriği zaten biliyorsa yeniden ayrıştırmak yerine doğrudan koyar.
+    _entries[path] = {"sig": signature(path), "value": value, "derived": {}}
+
+
+def invalidate(path: Path) -> None:
+    _entries.pop(path, None)
+
+
+def clear() -> None:
+    _entries.clear()
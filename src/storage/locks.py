@@ -0,0 +1,86 @@
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: kilitsiz çalışır (tek oturum)
+    fcntl = None
+
+# Dosya başına süreçler arası kilit (<dosya>.lock yan dosyası üzerinde flock).
+# Okuyucular paylaşımlı, yazıcılar özel kilit alır. Kilit veri dosyasında değil yan
+# dosyada tutulur; böylece os.replace ile değiştirilen dosyanın kilidi kaybolmaz.
+# Aynı iş parçacığında iç içe alınabilir; paylaşımlı kilit tutarken özel kilit
+# istenirse aynı tanımlayıcı üzerinde yükseltilir.
+
+_local = threading.local()
+
+
+def lock_path(path: Path) -> Path:
+    return path.with_name(path.name + ".lock")
+
+
+def _held() -> dict:
+    held = getattr(_local, "held", None)
+    if held is None:
+        held = _local.held = {}
+    return held
+
+
+@contextmanager
+def _lock(path: Path, exclusive: bool) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    key = lock_path(Path(path))
+    held = _held()
+    entry = held.get(key)
+    upgraded = False
+    if entry is None:
+        key.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except BaseException:
+            os.close(fd)
+            raise
+        entry = held[key] = {"fd": fd, "exclusive": exclusive, "depth": 0}
+    elif exclusive and not entry["exclusive"]:
+        fcntl.flock(entry["fd"], fcntl.LOCK_EX)
+        entry["exclusive"] = upgraded = True
+    entry["depth"] += 1
+    try:
+        yield
+    finally:
+        entry["depth"] -= 1
+        if entry["depth"] == 0:
+            held.pop(key, None)
+            os.close(entry["fd"])
+        elif upgraded:
+            fcntl.flock(entry["fd"], fcntl.LOCK_SH)
+            entry["exclusive"] = False
+
+
+def shared(path: Path):
+    return _lock(path, False)
+
+
+def exclusive(path: Path):
+    return _lock(path, True)
+
+
+def replace_file(path: Path, write, mode: str = "wb", **open_kwargs) -> None:
+    # write(f) geçici dosyaya yazar; tamamlanınca os.replace ile tek adımda yerine geçer.
+    # Okuyucular ya eski ya yeni dosyayı görür, yarım dosya oluşmaz.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with tmp.open(mode, **open_kwargs) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
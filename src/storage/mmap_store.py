@@ -0,0 +1,129 @@
+import mmap
+from pathlib import Path
+from typing import Iterator
+
+from src.storage import locks, txt_store
+from src.storage.txt_store import ENC, SEP, index_path
+
+# Paylaşılan TSV dosyası için user_id -> satır bayt ofsetleri yan dizini (<dosya>.idx):
+#   #<TAB>inode
+#   user_id<TAB>ofset
+# Dizin okuma sırasında dosyanın dizinlenmemiş kuyruğu taranarak artımlı uzatılır;
+# txt_store.write_rows yan dosyayı siler, bir sonraki okumada baştan kurulur.
+
+_indexes: dict[Path, dict] = {}
+
+
+def _empty(ino: int) -> dict:
+    return {"ino": ino, "end": 0, "offsets": {}}
+
+
+def _load(path: Path, ino: int) -> dict:
+    idx = _empty(ino)
+    side = index_path(path)
+    if not side.exists():
+        return idx
+    with side.open("r", encoding=ENC, newline="") as f:
+        header = f.readline().rstrip("\n").split(SEP)
+        if header[:1] != ["#"] or header[1:2] != [str(ino)]:
+            return idx
+        for line in f:
+            uid, _, off = line.rstrip("\n").partition(SEP)
+            if off.isdigit():
+                idx["offsets"].setdefault(uid, []).append(int(off))
+    if idx["offsets"]:
+        last = max(max(v) for v in idx["offsets"].values())
+        with path.open("rb") as f:
+            f.seek(last)
+            idx["end"] = last + len(f.readline())
+    return idx
+
+
+def _extend(path: Path, idx: dict) -> None:
+    # dizinlenmiş kısımdan sonra eklenen tam satırları tarar
+    new: list[tuple[str, int]] = []
+    with path.open("rb") as f:
+        f.seek(idx["end"])
+        off = idx["end"]
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            start = off
+            off += len(line)
+            if not line.strip() or line.startswith(b"#"):
+                continue
+            parts = line.split(SEP.encode(ENC), 2)
+            if len(parts) < 2:
+                continue
+            new.append((parts[1].decode(ENC).strip(), start))
+        idx["end"] = off
+    if not new:
+        return
+    side = index_path(path)
+    fresh = not side.exists() or not any(idx["offsets"].values())
+    with side.open("w" if fresh else "a", encoding=ENC, newline="") as f:
+        if fresh:
+            f.write(f"#{SEP}{idx['ino']}\n")
+        for uid, start in new:
+            idx["offsets"].setdefault(uid, []).append(start)
+            f.write(f"{uid}{SEP}{start}\n")
+
+
+def _index(path: Path) -> dict | None:
+    with locks.exclusive(index_path(path)):
+        return _index_locked(path)
+
+
+def _index_locked(path: Path) -> dict | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    idx = _indexes.get(path)
+    if idx is None or idx["ino"] != st.st_ino or idx["end"] > st.st_size or not index_path(path).exists():
+        if idx is not None:
+            index_path(path).unlink(missing_ok=True)
+        idx = _load(path, st.st_ino)
+        _indexes[path] = idx
+    if idx["end"] < st.st_size:
+        _extend(path, idx)
+    return idx
+
+
+def drop_index(path: Path) -> None:
+    _indexes.pop(path, None)
+    index_path(path).unlink(missing_ok=True)
+
+
+def iter_rows_for_user(path: Path, user_id: str) -> Iterator[list[str]]:
+    # Yalnızca kullanıcının satırlarını mmap üzerinden çözer; günlük üstüne uygulanır.
+    txt_store.flush(path)
+    with locks.shared(path):
+        yield from _iter_user(path, user_id)
+
+
+def _iter_user(path: Path, user_id: str) -> Iterator[list[str]]:
+    idx = _index(path)
+    if idx is None:
+        return
+    offsets = list(idx["offsets"].get(user_id, ()))
+    if not offsets:
+        return
+    ops = txt_store.read_journal(path)
+    rows: list[list[str]] = []
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for off in offsets:
+            end = mm.find(b"\n", off)
+            row = mm[off:end].decode(ENC).split(SEP)
+            if len(row) < 2 or row[1].strip() != user_id:
+                # dosya dizin dışında yeniden yazılmış; dizini baştan kur
+                drop_index(path)
+                yield from (r for r in txt_store.iter_rows(path) if len(r) > 1 and r[1].strip() == user_id)
+                return
+            rows.append(row)
+    for row in rows:
+        if ops and row[0] in ops:
+            if ops[row[0]] is None:
+                continue
+            row = list(ops[row[0]])
+        yield row
@@ -0,0 +1,89 @@
+import re
+import sys
+from pathlib import Path
+
+from src.core.config import TRANSACTIONS_DIR, TRANSACTIONS_FILE
+from src.storage import txt_store
+
+# Kullanıcı başına işlem dosyası: data/transactions/<user_id>.tsv (TRANSACTIONS_LAYOUT = "sharded").
+# Satır biçimi paylaşılan dosyayla aynıdır; günlük ve yeniden yazma dosya başına çalışır.
+
+SUFFIX = ".tsv"
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+_FLUSH_ROWS = 50_000
+
+
+def shard_path(user_id: str) -> Path:
+    uid = (user_id or "").strip()
+    if not _SAFE_ID.match(uid):
+        raise ValueError("Kullanıcı ID geçersiz.")
+    return TRANSACTIONS_DIR / f"{uid}{SUFFIX}"
+
+
+def shard_paths() -> list[Path]:
+    if not TRANSACTIONS_DIR.exists():
+        return []
+    return sorted(TRANSACTIONS_DIR.glob(f"*{SUFFIX}"))
+
+
+def migrate_to_shards(source: Path = TRANSACTIONS_FILE) -> dict[str, int]:
+    # Paylaşılan dosyayı (günlük uygulanmış haliyle) kullanıcı dosyalarına böler.
+    # Önce geçici klasöre yazar, bitince yerine taşır; kaynak dosyaya dokunmaz.
+    if shard_paths():
+        raise ValueError(f"{TRANSACTIONS_DIR} boş değil; bölme zaten yapılmış.")
+    tmp = TRANSACTIONS_DIR.with_name(TRANSACTIONS_DIR.name + ".tmp")
+    tmp.mkdir(parents=True, exist_ok=True)
+    for old in tmp.glob(f"*{SUFFIX}"):
+        old.unlink()
+
+    counts = {"rows": 0, "users": 0, "skipped": 0}
+    buffers: dict[str, list[str]] = {}
+    pending = 0
+
+    def flush() -> None:
+        for uid, lines in buffers.items():
+            with (tmp / f"{uid}{SUFFIX}").open("a", encoding=txt_store.ENC, newline="") as f:
+                f.writelines(lines)
+        buffers.clear()
+
+    seen: set[str] = set()
+    for row in txt_store.iter_rows(source):
+        uid = row[1].strip() if len(row) > 1 else ""
+        if not _SAFE_ID.match(uid):
+            counts["skipped"] += 1
+            continue
+        buffers.setdefault(uid, []).append(txt_store.SEP.join(row) + "\n")
+        seen.add(uid)
+        counts["rows"] += 1
+        pending += 1
+        if pending >= _FLUSH_ROWS:
+            flush()
+            pending = 0
+    flush()
+
+    TRANSACTIONS_DIR.mkdir(parents=True, exist_ok=True)
+    for p in tmp.glob(f"*{SUFFIX}"):
+        p.replace(TRANSACTIONS_DIR / p.name)
+    tmp.rmdir()
+    counts["users"] = len(seen)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["migrate"]:
+        print("Kullanım: python -m src.storage.shards migrate")
+        return
+    try:
+        c = migrate_to_shards()
+    except ValueError as e:
+        print(e)
+        return
+    print(f"{c['rows']} kayıt {c['users']} kullanıcı dosyasına bölündü -> {TRANSACTIONS_DIR}")
+    if c["skipped"]:
+        print(f"{c['skipped']} satır geçersiz kullanıcı ID nedeniyle atlandı.")
+    print('config.py içinde TRANSACTIONS_LAYOUT = "sharded" yapın.')
+
+
+if __name__ == "__main__":
+    main()
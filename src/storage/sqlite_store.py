@@ -0,0 +1,190 @@
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator
+
+from src.core.config import SQLITE_FILE, USERS_FILE, CATEGORIES_FILE, TRANSACTIONS_FILE
+from src.core.validation import date_ordinal
+from src.storage import txt_store
+
+# txt_store ile aynı satır arayüzü (list[str], TSV sütun sırası); tablo adı dosya adından gelir.
+# seq ekleme sırasını korur, day tarih sıralı sorgular için gün sayısıdır.
+TABLES = {
+    "users": ["user_id", "username", "password"],
+    "categories": ["category_id", "user_id", "type", "name"],
+    "transactions": ["transaction_id", "user_id", "date", "type", "amount", "category_id", "description"],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, version INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS users (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT UNIQUE, username TEXT, password TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_id TEXT UNIQUE, user_id TEXT, type TEXT, name TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_categories_user ON categories(user_id);
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    transaction_id TEXT UNIQUE, user_id TEXT, date TEXT, type TEXT,
+    amount TEXT, category_id TEXT, description TEXT, day INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_transactions_user_day ON transactions(user_id, day);
+CREATE INDEX IF NOT EXISTS ix_transactions_user_type ON transactions(user_id, type);
+CREATE INDEX IF NOT EXISTS ix_transactions_category ON transactions(category_id);
+"""
+
+_BATCH = 500
+
+_lock = threading.RLock()
+_conn: sqlite3.Connection | None = None
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        SQLITE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(SQLITE_FILE, check_same_thread=False)
+        _conn.executescript(_SCHEMA)
+    return _conn
+
+
+def table_for(path: Path) -> str | None:
+    return path.stem if path.stem in TABLES else None
+
+
+def _values(table: str, fields: list[str]) -> list:
+    cols = TABLES[table]
+    vals = [f or "" for f in fields[: len(cols)]]
+    vals += [""] * (len(cols) - len(vals))
+    if table == "transactions":
+        vals.append(date_ordinal(vals[2]))
+    return vals
+
+
+def _insert_sql(table: str, verb: str = "INSERT") -> str:
+    cols = TABLES[table] + (["day"] if table == "transactions" else [])
+    return f"{verb} INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+
+
+def _bump(conn: sqlite3.Connection, table: str) -> None:
+    conn.execute(
+        "INSERT INTO meta (name, version) VALUES (?, 1) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+        (table,),
+    )
+
+
+def signature(path: Path):
+    table = table_for(path)
+    with _lock:
+        row = _connect().execute("SELECT version FROM meta WHERE name = ?", (table,)).fetchone()
+    return ("sqlite", table, row[0] if row else 0)
+
+
+def _iter_query(sql: str, params=()) -> Iterator[list[str]]:
+    # Kilit yalnızca her parti okunurken tutulur; satırlar parti parti akar.
+    with _lock:
+        cur = _connect().execute(sql, params)
+    while True:
+        with _lock:
+            batch = cur.fetchmany(_BATCH)
+        if not batch:
+            return
+        for r in batch:
+            yield [v or "" for v in r]
+
+
+def iter_rows(path: Path) -> Iterator[list[str]]:
+    table = table_for(path)
+    cols = ", ".join(TABLES[table])
+    return _iter_query(f"SELECT {cols} FROM {table} ORDER BY seq")
+
+
+def read_rows(path: Path) -> list[list[str]]:
+    return list(iter_rows(path))
+
+
+def iter_rows_for_user(path: Path, user_id: str) -> Iterator[list[str]]:
+    table = table_for(path)
+    cols = ", ".join(TABLES[table])
+    return _iter_query(f"SELECT {cols} FROM {table} WHERE user_id = ? ORDER BY seq", (user_id,))
+
+
+def append_row(path: Path, fields: list[str]) -> None:
+    table = table_for(path)
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute(_insert_sql(table), _values(table, fields))
+            _bump(conn, table)
+
+
+def append_rows(path: Path, rows: list[list[str]]) -> None:
+    table = table_for(path)
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.executemany(_insert_sql(table), (_values(table, r) for r in rows))
+            _bump(conn, table)
+
+
+def update_row(path: Path, fields: list[str]) -> None:
+    table = table_for(path)
+    cols = TABLES[table] + (["day"] if table == "transactions" else [])
+    vals = _values(table, fields)
+    assignments = ", ".join(f"{c} = ?" for c in cols[1:])
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute(f"UPDATE {table} SET {assignments} WHERE {cols[0]} = ?", [*vals[1:], vals[0]])
+            _bump(conn, table)
+
+
+def delete_row(path: Path, row_id: str) -> None:
+    table = table_for(path)
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute(f"DELETE FROM {table} WHERE {TABLES[table][0]} = ?", (row_id,))
+            _bump(conn, table)
+
+
+def write_rows(path: Path, rows: list[list[str]]) -> None:
+    table = table_for(path)
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute(f"DELETE FROM {table}")
+            conn.executemany(_insert_sql(table, "INSERT OR REPLACE"), (_values(table, r) for r in rows))
+            _bump(conn, table)
+
+
+def compact(path: Path) -> None:
+    return None
+
+
+def migrate_from_txt() -> dict[str, int]:
+    # data/*.txt içeriğini (günlük uygulanmış haliyle) veritabanına aktarır; var olan tablo içeriği değişir.
+    counts: dict[str, int] = {}
+    for path in (USERS_FILE, CATEGORIES_FILE, TRANSACTIONS_FILE):
+        rows = [r for r in txt_store.read_rows(path) if r and r[0].strip()]
+        write_rows(path, rows)
+        counts[table_for(path)] = len(rows)
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["migrate"]:
+        print("Kullanım: python -m src.storage.sqlite_store migrate")
+        return
+    for table, n in migrate_from_txt().items():
+        print(f"{table}: {n} satır aktarıldı -> {SQLITE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
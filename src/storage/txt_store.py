@@ -1,21 +1,202 @@
+import atexit
+import os
+import threading
 from pathlib import Path
+from typing import Callable, Iterator
+
+from src.core.config import GROUP_COMMIT_DELAY, GROUP_COMMIT_ROWS, JOURNAL_COMPACT_THRESHOLD, WRITE_FSYNC
+from src.storage import locks
 
 SEP ="\t"
 ENC = "utf-8"
 
-def read_rows(path: Path) -> list[list[str]]:
+# Güncelleme/silme kayıtları ana dosyayı yeniden yazmak yerine yan dosyaya eklenir:
+#   U<TAB>satırın yeni hali (ilk alan id)
+#   D<TAB>id
+# Okuyucular günlüğü ana dosyanın üstüne uygular; compact() ikisini birleştirir.
+OP_UPDATE = "U"
+OP_DELETE = "D"
+
+_journal_counts: dict[Path, int] = {}
+
+# Toplu yazma: dosya -> {"rows": bekleyen satırlar, "on_flush": kanca, "timer": zamanlayıcı}
+# on_flush(path, rows) grup yazılmadan hemen önce dosyanın özel kilidi altında çağrılır;
+# döndürdüğü fonksiyon (varsa) yazmadan sonra çalışır.
+FlushHook = Callable[[Path, list[list[str]]], Callable[[], None] | None]
+_pending: dict[Path, dict] = {}
+_pending_lock = threading.Lock()
+
+
+def journal_path(path: Path) -> Path:
+    return path.with_name(path.name + ".journal")
+
+
+def index_path(path: Path) -> Path:
+    # mmap_store'un kullanıcı ofset dizini; dosya yeniden yazılınca geçersizdir
+    return path.with_name(path.name + ".idx")
+
+
+def _stat_signature(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def signature(path: Path):
+    # günlük yan dosyası da okunan içeriğin parçası; bekleyen grup önce yazılır
+    flush(path)
+    return (_stat_signature(path), _stat_signature(journal_path(path)))
+
+
+def split_lines(lines) -> Iterator[list[str]]:
+    # boş ve yorum (#) satırlarını atlayarak alanlara böler
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        yield line.rstrip("\n").split(SEP)
+
+
+def _iter_base_rows(path: Path) -> Iterator[list[str]]:
     if not path.exists():
-        return[]
-    rows: list[list[str]] = []
+        return
     with path.open("r", encoding=ENC,newline="") as f:
-        for line in f:
-            if not line.strip() or line.startswith("#"):
+        yield from split_lines(f)
+
+
+def read_journal(path: Path) -> dict[str, list[str] | None]:
+    # id -> son hali (silindiyse None)
+    ops: dict[str, list[str] | None] = {}
+    with locks.shared(path):
+        records = list(_iter_base_rows(journal_path(path)))
+    for rec in records:
+        if rec[0] == OP_UPDATE and len(rec) > 1:
+            ops[rec[1]] = rec[1:]
+        elif rec[0] == OP_DELETE and len(rec) > 1:
+            ops[rec[1]] = None
+    _journal_counts[path] = len(records)
+    return ops
+
+
+def iter_rows(path: Path) -> Iterator[list[str]]:
+    # Satır satır okur; bellekte yalnızca günlük (en fazla eşik kadar kayıt) tutulur.
+    # Okuma bitene kadar paylaşımlı kilit tutulur.
+    flush(path)
+    with locks.shared(path):
+        yield from apply_journal(_iter_base_rows(path), read_journal(path))
+
+
+def apply_journal(rows, ops: dict[str, list[str] | None]) -> Iterator[list[str]]:
+    for row in rows:
+        if ops and row[0] in ops:
+            if ops[row[0]] is None:
                 continue
-            rows.append(line.rstrip("\n").split(SEP))
-    return rows
+            row = list(ops[row[0]])
+        yield row
+
+
+def read_rows(path: Path) -> list[list[str]]:
+    return list(iter_rows(path))
+
 
 def append_row(path: Path, fields: list[str]) -> None:
+    append_rows(path, [fields])
+
+
+def append_rows(path: Path, rows: list[list[str]]) -> None:
+    # tek açılış, tek tamponlu yazma; özel kilit altında, okuyucular yarım satır görmez
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding=ENC, newline="") as f:
-        f.write(SEP.join(fields) + "\n")
+    with locks.exclusive(path), path.open("a", encoding=ENC, newline="") as f:
+        f.writelines(SEP.join(r) + "\n" for r in rows)
+        if WRITE_FSYNC:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def buffer_row(path: Path, fields: list[str], on_flush: FlushHook | None = None) -> None:
+    # Satırı gruba ekler; GROUP_COMMIT_ROWS dolunca ya da GROUP_COMMIT_DELAY geçince
+    # grup tek append_rows ile yazılır.
+    with _pending_lock:
+        group = _pending.get(path)
+        if group is None:
+            group = _pending[path] = {"rows": [], "on_flush": on_flush, "timer": None}
+            if GROUP_COMMIT_DELAY > 0:
+                timer = threading.Timer(GROUP_COMMIT_DELAY, flush, args=(path,))
+                timer.daemon = True
+                timer.start()
+                group["timer"] = timer
+        group["rows"].append(fields)
+        full = len(group["rows"]) >= GROUP_COMMIT_ROWS
+    if full:
+        flush(path)
+
+
+def flush(path: Path | None = None) -> None:
+    # path verilmezse bekleyen tüm gruplar yazılır
+    for p in [path] if path is not None else list(_pending):
+        if p not in _pending:
+            continue
+        with locks.exclusive(p):
+            with _pending_lock:
+                group = _pending.pop(p, None)
+            if group is None:
+                continue
+            if group["timer"] is not None:
+                group["timer"].cancel()
+            after = group["on_flush"](p, group["rows"]) if group["on_flush"] else None
+            append_rows(p, group["rows"])
+            if after is not None:
+                after()
+
+
+atexit.register(flush)
+
+
+def write_rows(path: Path, rows) -> None:
+    # Geçici dosyaya yazılıp os.replace ile değiştirilir; rows aynı dosyadan okuyan
+    # bir üreteç olabilir.
+    def write(f) -> None:
+        for r in rows:
+            f.write(SEP.join(r) + "\n")
+
+    with locks.exclusive(path):
+        locks.replace_file(path, write, "w", encoding=ENC, newline="")
+        journal_path(path).unlink(missing_ok=True)
+        index_path(path).unlink(missing_ok=True)
+        _journal_counts[path] = 0
+
+
+def _journal_count(path: Path) -> int:
+    if path not in _journal_counts:
+        read_journal(path)
+    return _journal_counts[path]
+
+
+def _append_journal(path: Path, record: list[str]) -> None:
+    # günlük ana dosyanın parçası; kilit ana dosya adına alınır
+    with locks.exclusive(path):
+        if not journal_path(path).exists():
+            _journal_counts[path] = 0  # başka bir süreç sıkıştırmış olabilir
+        count = _journal_count(path)
+        journal_path(path).parent.mkdir(parents=True, exist_ok=True)
+        with journal_path(path).open("a", encoding=ENC, newline="") as f:
+            f.write(SEP.join(record) + "\n")
+        _journal_counts[path] = count + 1
+        if _journal_counts[path] >= JOURNAL_COMPACT_THRESHOLD:
+            compact(path)
+
+
+def update_row(path: Path, fields: list[str]) -> None:
+    _append_journal(path, [OP_UPDATE, *fields])
+
+
+def delete_row(path: Path, row_id: str) -> None:
+    _append_journal(path, [OP_DELETE, row_id])
+
 
+def compact(path: Path) -> None:
+    with locks.exclusive(path):
+        if not journal_path(path).exists():
+            return
+        write_rows(path, iter_rows(path))
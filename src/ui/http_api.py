@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.core import instrument
+from src.core.config import PAGE_SIZE, ensure_data_files_exist
+from src.services import auth_service, category_service, report_service, transaction_service
+
+# Yalnızca standart kütüphane ile asyncio HTTP/JSON sunucusu.
+# Oturum: POST /login -> {"token": ...}; sonraki isteklerde "Authorization: Bearer <token>".
+# Servis çağrıları (dosya G/Ç) iş parçacığı havuzunda çalışır; olay döngüsü bloklanmaz.
+# Tutarlar kuruş (int) olarak döner, girişte "12.50" gibi metin kabul edilir.
+#
+#   POST   /register                {username, password, password2}
+#   POST   /login                   {username, password}
+#   POST   /logout
+#   GET    /categories
+#   GET    /transactions?type=
+#   GET    /transactions?type=&limit=&cursor=&order=newest|oldest   sayfalı; {rows, next_cursor, total}
+#   POST   /transactions            {type, amount, date, category_id, description}
+#   PATCH  /transactions/<id>       {date?, amount?, category_id?, description?}
+#   DELETE /transactions/<id>
+#   GET    /reports/<ad>?...        bkz. REPORTS
+
+MAX_BODY = 1 << 20
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _q(query: dict, name: str, default=None):
+    vals = query.get(name)
+    return vals[0] if vals else default
+
+
+def _int(query: dict, name: str, default: int) -> int:
+    try:
+        return int(_q(query, name, default))
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' sayı olmalı.")
+
+
+# ad -> (user_id, sorgu parametreleri) ile çağrılan rapor
+REPORTS: Dict[str, Callable[[str, dict], object]] = {
+    "totals": lambda uid, q: report_service.totals_all(uid),
+    "weekly": lambda uid, q: report_service.weekly_summary(uid),
+    "month": lambda uid, q: report_service.current_month_summary(uid),
+    "range": lambda uid, q: report_service.range_summary(uid, _q(q, "start", ""), _q(q, "end", "")),
+    "last-12-months": lambda uid, q: report_service.last_12_months_table(uid),
+    "by-category": lambda uid, q: [
+        {"category": name, "amount_cents": cents}
+        for name, cents in report_service.by_category(uid, _q(q, "type", "expense"), _q(q, "start"), _q(q, "end"))
+    ],
+    "total-by-type": lambda uid, q: {"amount_cents": report_service.total_by_type(uid, _q(q, "type", ""))},
+    "balance": lambda uid, q: {"amount_cents": report_service.balance(uid)},
+    "last-n-days": lambda uid, q: report_service.totals_last_n_days(uid, _int(q, "n", 30)),
+    "monthly": lambda uid, q: report_service.monthly_breakdown(
+        uid, _int(q, "year", date.today().year), _q(q, "type")
+    ),
+}
+
+
+def _token(headers: dict) -> str:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    return token.strip() if scheme.lower() == "bearer" else ""
+
+
+def _session_user(headers: dict) -> dict:
+    user = auth_service.session_user(_token(headers))
+    if user is None:
+        raise HttpError(HTTPStatus.UNAUTHORIZED, "Oturum geçersiz, önce giriş yapın.")
+    return user
+
+
+def _body_str(body: dict, name: str) -> str:
+    val = body.get(name)
+    return "" if val is None else str(val)
+
+
+def _body_opt(body: dict, name: str) -> Optional[str]:
+    # isteğe bağlı alan: yoksa None (servis varsayılanı), varsa metin
+    val = body.get(name)
+    return None if val is None else str(val)
+
+
+def route(method: str, path: str, query: dict, headers: dict, body: dict) -> Tuple[HTTPStatus, object]:
+    # Bloklayan kısım; iş parçacığı havuzunda çalışır.
+    parts = [p for p in path.split("/") if p]
+
+    if method == "POST" and parts == ["register"]:
+        user = auth_service.register(
+            _body_str(body, "username"), _body_str(body, "password"), _body_str(body, "password2")
+        )
+        return HTTPStatus.CREATED, user
+    if method == "POST" and parts == ["login"]:
+        user = auth_service.login(_body_str(body, "username"), _body_str(body, "password"))
+        return HTTPStatus.OK, {"token": auth_service.start_session(user), "user": user}
+
+    user = _session_user(headers)
+    uid = user["user_id"]
+
+    if method == "POST" and parts == ["logout"]:
+        auth_service.end_session(_token(headers))
+        return HTTPStatus.OK, {"ok": True}
+    if method == "GET" and parts == ["categories"]:
+        return HTTPStatus.OK, category_service.list_categories(uid)
+    if parts[:1] == ["transactions"]:
+        if len(parts) == 1 and method == "GET":
+            if "limit" in query or "cursor" in query:
+                if _q(query, "order", "newest") not in ("newest", "oldest"):
+                    raise ValueError("'order' newest ya da oldest olmalı.")
+                page = transaction_service.list_transactions_page(
+                    uid,
+                    _q(query, "type"),
+                    _q(query, "cursor"),
+                    _int(query, "limit", PAGE_SIZE),
+                    _q(query, "order", "newest") == "newest",
+                )
+                return HTTPStatus.OK, page
+            return HTTPStatus.OK, transaction_service.list_transactions(uid, _q(query, "type"))
+        if len(parts) == 1 and method == "POST":
+            tx = transaction_service.create_transaction(
+                uid,
+                _body_str(body, "type"),
+                _body_str(body, "amount"),
+                _body_opt(body, "date"),
+                _body_opt(body, "category_id"),
+                _body_str(body, "description"),
+            )
+            return HTTPStatus.CREATED, tx
+        if len(parts) == 2 and method == "PATCH":
+            changes = {k: _body_opt(body, k) for k in body}
+            return HTTPStatus.OK, transaction_service.update_transaction(uid, parts[1], changes)
+        if len(parts) == 2 and method == "DELETE":
+            transaction_service.delete_transaction_by_id(parts[1], uid)
+            return HTTPStatus.OK, {"ok": True}
+    if method == "GET" and len(parts) == 2 and parts[0] == "reports":
+        report = REPORTS.get(parts[1])
+        if report is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, "Rapor bulunamadı.")
+        return HTTPStatus.OK, report(uid, query)
+    raise HttpError(HTTPStatus.NOT_FOUND, "Adres bulunamadı.")
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict, bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "İstek satırı geçersiz.")
+    headers: Dict[str, str] = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Content-Length geçersiz.")
+    if length > MAX_BODY:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "İstek gövdesi çok büyük.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _response(status: HTTPStatus, payload, keep_alive: bool) -> bytes:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + data
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, executor: ThreadPoolExecutor) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            keep_alive = False
+            try:
+                req = await _read_request(reader)
+                if req is None:
+                    break
+                method, target, headers, raw = req
+                keep_alive = headers.get("connection", "").lower() != "close"
+                url = urlsplit(target)
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    raise HttpError(HTTPStatus.BAD_REQUEST, "Gövde JSON olmalı.")
+                if not isinstance(body, dict):
+                    raise HttpError(HTTPStatus.BAD_REQUEST, "Gövde JSON nesnesi olmalı.")
+                status, payload = await loop.run_in_executor(
+                    executor, route, method, url.path, parse_qs(url.query), headers, body
+                )
+            except HttpError as e:
+                status, payload = e.status, {"error": str(e)}
+            except ValueError as e:
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception:
+                traceback.print_exc()
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Sunucu hatası."}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, workers: int = 8) -> None:
+    ensure_data_files_exist()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    server = await asyncio.start_server(lambda r, w: _handle(r, w, executor), host, port)
+    addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+    print(f"Dinleniyor: {addrs}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=True)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    p = argparse.ArgumentParser(prog="python -m src.ui.http_api")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--workers", type=int, default=8, help="iş parçacığı havuzu boyutu")
+    a = p.parse_args(argv)
+    instrument.setup()
+    try:
+        asyncio.run(serve(a.host, a.port, a.workers))
+    except KeyboardInterrupt:
+        print("\nSunucu durduruldu.")
+
+
+if __name__ == "__main__":
+    main()
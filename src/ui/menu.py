@@ -1,7 +1,9 @@
+from src.core.money import format_cents
 from src.services import auth_service
 from src.services import category_service
 from src.services import transaction_service
 from src.services import report_service
+from src.services import import_service
 
 
 def ask(prompt: str) -> str:
@@ -108,13 +110,13 @@ def category_menu(user: dict) -> None:
 
         elif sel == "2":
             type_ = ask_type_menu()
-            names = category_service.list_category_names_by_type(user["user_id"], type_)
-            if not names:
+            cats = category_service.list_categories_with_usage(user["user_id"], type_)
+            if not cats:
                 print(f"{type_} türünde kategori yok.")
             else:
                 print(f"\n{type_.upper()} kategorileri:")
-                for nm in names:
-                    print(f" - {nm}")
+                for c in cats:
+                    print(f" - {c['name'].strip()} ({c['usage']} kayıt)")
 
         elif sel == "3":
             type_ = ask_type_menu()
@@ -198,13 +200,53 @@ def transaction_menu(user: dict, type_: str) -> None:
         print("-" * (3 + 1 + 12 + 1 + 12 + 2 + col_cat + 1 + col_desc))
         for r in rows:
             date = r["date"]
-            amt = f"{float(r['amount']):.2f}"
+            amt = format_cents(r["amount_cents"])
             cat = (r["category_name"] or "(yok)")
             desc = (r["description"] or "")
             if len(desc) > col_desc:
                 desc = desc[: col_desc - 1] + "…"
             print(f"{r['index']:>3} {date:<12} {amt:>12}  {cat:<{col_cat}} {desc:<{col_desc}}")
 
+    def browse_txns(empty_msg, prompt=None):
+        # Kayıtları en yeniden eskiye sayfa sayfa gösterir. prompt verilirse sayfadan
+        # seçilen kaydı döndürür; n/p ile sayfa değiştirilir.
+        cursors = [None]
+        while True:
+            page = transaction_service.list_transactions_page(user["user_id"], type_, cursors[-1])
+            rows = page["rows"]
+            if not rows and len(cursors) == 1:
+                print(empty_msg)
+                return None
+            print_txn_table(rows)
+            nav = []
+            if page["next_cursor"]:
+                nav.append("n: sonraki")
+            if len(cursors) > 1:
+                nav.append("p: önceki")
+            if rows:
+                print(f"({rows[0]['index']}-{rows[-1]['index']} / {page['total']})")
+            if not nav and prompt is None:
+                return None
+            hint = f" [{', '.join(nav)}]" if nav else ""
+            s = ask(f"{prompt or 'Sayfa'}{hint}: ").strip().lower()
+            if s == "n" and page["next_cursor"]:
+                cursors.append(page["next_cursor"])
+                continue
+            if s == "p" and len(cursors) > 1:
+                cursors.pop()
+                continue
+            if prompt is None:
+                return None
+            try:
+                idx = int(s)
+            except ValueError:
+                idx = 0
+            for r in rows:
+                if r["index"] == idx:
+                    return r
+            print("Geçersiz numara.")
+            return None
+
     def choose_edit_field():
         print("""
 Hangi alanı düzenlemek istersiniz?
@@ -250,31 +292,21 @@ Hangi alanı düzenlemek istersiniz?
                     user["user_id"], type_, amount, date_s, cat_id, desc
                 )
                 cname = transaction_service.get_category_name_by_id(user["user_id"], tx["category_id"]) or "(yok)"
-                print(f"Eklendi: {tx['date']} | {tx['amount']:.2f} | {cname} | id={tx['transaction_id']}")
+                print(f"Eklendi: {tx['date']} | {format_cents(tx['amount_cents'])} | {cname} | id={tx['transaction_id']}")
             except ValueError as e:
                 print(f"Hata: {e}")
             except Exception as e:
                 print(f"Bilinmeyen Hata: {e}")
 
         elif sel == "2":
-            rows = transaction_service.enumerate_transactions_for_edit(user["user_id"], type_)
-            if not rows:
-                print(f"Hiç {header.lower()} kaydı yok.")
-                continue
-            print_txn_table(rows)
-            try:
-                idx = int(ask("Silinecek kayıt numarası (#): "))
-                if idx < 1 or idx > len(rows):
-                    print("Geçersiz numara.")
-                    continue
-            except ValueError:
-                print("Geçersiz numara.")
+            current = browse_txns(f"Hiç {header.lower()} kaydı yok.", "Silinecek kayıt numarası (#)")
+            if current is None:
                 continue
             ok = ask("Silmek istediğinize emin misiniz? (yes/no): ").lower()
             if ok not in ("y", "yes", "e", "evet"):
                 print("İşlem iptal edildi.")
                 continue
-            txn_id = rows[idx - 1]["transaction_id"]
+            txn_id = current["transaction_id"]
             try:
                 transaction_service.delete_transaction_by_id(txn_id, user["user_id"])
                 print("Kayıt silindi.")
@@ -284,24 +316,13 @@ Hangi alanı düzenlemek istersiniz?
                 print(f"Bilinmeyen Hata: {e}")
 
         elif sel == "3":
-            rows = transaction_service.enumerate_transactions_for_edit(user["user_id"], type_)
-            if not rows:
-                print(f"Düzenlenecek {header.lower()} kaydı yok.")
-                continue
-            print_txn_table(rows)
-            try:
-                idx = int(ask("Düzenlenecek kayıt numarası (#): "))
-                if idx < 1 or idx > len(rows):
-                    print("Geçersiz numara.")
-                    continue
-            except ValueError:
-                print("Geçersiz numara.")
+            current = browse_txns(f"Düzenlenecek {header.lower()} kaydı yok.", "Düzenlenecek kayıt numarası (#)")
+            if current is None:
                 continue
 
-            current = rows[idx - 1]
             temp_desc = current["description"]
             temp_cid = current["category_id"]
-            temp_amt = f"{current['amount']:.2f}"
+            temp_amt = format_cents(current["amount_cents"])
 
             while True:
                 cname = transaction_service.get_category_name_by_id(user["user_id"], temp_cid) or "(yok)"
@@ -326,15 +347,15 @@ Seçilen kayıt:
                     temp_amt = ask("Yeni tutar: ")
                 elif field == "commit":
                     try:
-                        old_amt = f"{current['amount']:.2f}"
-                        new_amt_f = transaction_service._parse_amount_no_try(temp_amt)
-                        new_amt_s = f"{new_amt_f:.2f}"
-                        if old_amt != new_amt_s:
-                            transaction_service.update_transaction_by_index(user["user_id"], type_, idx, "amount", temp_amt)
+                        changes = {}
+                        if format_cents(current["amount_cents"]) != temp_amt:
+                            changes["amount"] = temp_amt
                         if (current["category_id"] or None) != (temp_cid or None):
-                            transaction_service.update_transaction_by_index(user["user_id"], type_, idx, "category_id", temp_cid or "")
+                            changes["category_id"] = temp_cid or ""
                         if (current["description"] or "") != (temp_desc or ""):
-                            transaction_service.update_transaction_by_index(user["user_id"], type_, idx, "description", temp_desc or "")
+                            changes["description"] = temp_desc or ""
+                        if changes:
+                            transaction_service.update_transaction(user["user_id"], current["transaction_id"], changes)
                         print("Değişiklikler kaydedildi.")
                     except ValueError as e:
                         print(f"Hata: {e}")
@@ -348,11 +369,7 @@ Seçilen kayıt:
                     break
 
         elif sel == "4":
-            rows = transaction_service.enumerate_transactions_for_edit(user["user_id"], type_)
-            if not rows:
-                print(f"Hiç {header.lower()} kaydı yok.")
-                continue
-            print_txn_table(rows)
+            browse_txns(f"Hiç {header.lower()} kaydı yok.")
 
         elif sel == "5":
             break
@@ -389,30 +406,30 @@ def reports_menu(user: dict) -> None:
         if sel == "1":
             s = report_service.totals_all(user["user_id"])
             print("\nGENEL TOPLAM")
-            print(f"{'Gelir:':>10} {s['income']:>12.2f}")
-            print(f"{'Gider:':>10} {s['expense']:>12.2f}")
-            print(f"{'Bakiye:':>10} {s['net']:>12.2f}")
+            print(f"{'Gelir:':>10} {format_cents(s['income']):>12}")
+            print(f"{'Gider:':>10} {format_cents(s['expense']):>12}")
+            print(f"{'Bakiye:':>10} {format_cents(s['net']):>12}")
 
         elif sel == "2":
             s = report_service.weekly_summary(user["user_id"])
             print("\nSON 7 GÜN")
-            print(f"{'Gelir:':>10} {s['income']:>12.2f}")
-            print(f"{'Gider:':>10} {s['expense']:>12.2f}")
-            print(f"{'Bakiye:':>10} {s['net']:>12.2f}")
+            print(f"{'Gelir:':>10} {format_cents(s['income']):>12}")
+            print(f"{'Gider:':>10} {format_cents(s['expense']):>12}")
+            print(f"{'Bakiye:':>10} {format_cents(s['net']):>12}")
 
         elif sel == "3":
             s = report_service.current_month_summary(user["user_id"])
             print("\nBU AY")
-            print(f"{'Gelir:':>10} {s['income']:>12.2f}")
-            print(f"{'Gider:':>10} {s['expense']:>12.2f}")
-            print(f"{'Bakiye:':>10} {s['net']:>12.2f}")
+            print(f"{'Gelir:':>10} {format_cents(s['income']):>12}")
+            print(f"{'Gider:':>10} {format_cents(s['expense']):>12}")
+            print(f"{'Bakiye:':>10} {format_cents(s['net']):>12}")
 
         elif sel == "4":
             rows = report_service.last_12_months_table(user["user_id"])
             print("\nYYYY-AA        GELİR        GİDER       BAKİYE")
             print("------------------------------------------------")
             for r in rows:
-                print(f"{r['period']:>7s} {r['income']:12.2f} {r['expense']:12.2f} {r['balance']:12.2f}")
+                print(f"{r['period']:>7s} {format_cents(r['income']):>12} {format_cents(r['expense']):>12} {format_cents(r['balance']):>12}")
 
         elif sel == "5":
             start = ask_date("Başlangıç")
@@ -420,9 +437,9 @@ def reports_menu(user: dict) -> None:
             try:
                 s = report_service.range_summary(user["user_id"], start, end)
                 print(f"\n{start} - {end}")
-                print(f"{'Gelir:':>10} {s['income']:>12.2f}")
-                print(f"{'Gider:':>10} {s['expense']:>12.2f}")
-                print(f"{'Bakiye:':>10} {s['net']:>12.2f}")
+                print(f"{'Gelir:':>10} {format_cents(s['income']):>12}")
+                print(f"{'Gider:':>10} {format_cents(s['expense']):>12}")
+                print(f"{'Bakiye:':>10} {format_cents(s['net']):>12}")
             except ValueError as e:
                 print(f"Hata: {e}")
 
@@ -447,7 +464,7 @@ def reports_menu(user: dict) -> None:
                 width = max(15, max(len((name or '').strip() or '(yok)') for name, _ in rows))
                 for name, total in rows:
                     safe = (name or "").strip() or "(yok)"
-                    print(f"{safe:<{width}} : {total:>12.2f}")
+                    print(f"{safe:<{width}} : {format_cents(total):>12}")
 
         elif sel == "7":
             break
@@ -455,6 +472,28 @@ def reports_menu(user: dict) -> None:
             print("Yanlış seçim.")
 
 
+def import_menu(user: dict) -> None:
+    print("""İÇE AKTAR
+İlk satır başlık olmalı: tarih/date, tutar/amount (zorunlu),
+tür/type, kategori/category, açıklama/description (isteğe bağlı).
+Tür sütunu yoksa eksi tutarlar gider sayılır.
+""")
+    path = ask("Dosya yolu: ")
+    if not path:
+        print("İşlem iptal edildi.")
+        return
+    try:
+        result = import_service.import_transactions(user["user_id"], path)
+    except (ValueError, OSError) as e:
+        print(f"Hata: {e}")
+        return
+    print(f"{result['imported']} kayıt eklendi, {len(result['errors'])} satır atlandı.")
+    for line_no, msg in result["errors"][:20]:
+        print(f"  satır {line_no}: {msg}")
+    if len(result["errors"]) > 20:
+        print(f"  ... ve {len(result['errors']) - 20} satır daha")
+
+
 def app_menu(user: dict) -> None:
     while True:
         print("""ANA MENÜ
@@ -463,7 +502,8 @@ def app_menu(user: dict) -> None:
   3) Kategori Yönetimi
   4) Raporlar
   5) Hesap/oturum
-  6) Çıkış
+  6) İçe Aktar (CSV/TSV)
+  7) Çıkış
 """)
         secim = ask("Seçiminiz: ").strip()
         if secim == "1":
@@ -477,6 +517,8 @@ def app_menu(user: dict) -> None:
         elif secim == "5":
             print("Hesap işlemleri oluşturulacak.")
         elif secim == "6":
+            import_menu(user)
+        elif secim == "7":
             break
         else:
             print("Yanlış seçim.")
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from src.core.config import USERS_FILE, USERS_INDEX_FILE, ensure_data_files_exist
+from src.services import auth_service
+from src.storage import file_cache
+
+
+class LegacyPasswordTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        file_cache.clear()
+        ensure_data_files_exist()
+        USERS_FILE.write_text("u1\tAyseK\tduzsifre1\n", encoding="utf-8")
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        file_cache.clear()
+        self._tmp.cleanup()
+
+    def test_plaintext_never_reaches_index(self):
+        self.assertIsNotNone(auth_service.find_user("aysek"))
+        self.assertNotIn("duzsifre1", USERS_INDEX_FILE.read_text(encoding="utf-8"))
+        self.assertNotIn("duzsifre1", USERS_FILE.read_text(encoding="utf-8"))
+        self.assertEqual(auth_service.login("AyseK", "duzsifre1")["user_id"], "u1")
+        with self.assertRaises(ValueError):
+            auth_service.login("AyseK", "yanlis123")
+
+    def test_old_index_with_plaintext_is_rebuilt(self):
+        sig = repr(file_cache.signature(USERS_FILE))
+        USERS_INDEX_FILE.write_text(f"S\t{sig}\nU\tayse\tu1\tAyseK\tduzsifre1\n", encoding="utf-8")
+        self.assertEqual(auth_service.login("aysek", "duzsifre1")["user_id"], "u1")
+        self.assertNotIn("duzsifre1", USERS_INDEX_FILE.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
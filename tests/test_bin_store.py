@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from src.core.config import TRANSACTIONS_FILE, ensure_data_files_exist
+from src.storage import bin_store, file_cache
+
+TID = "11111111-1111-1111-1111-111111111111"
+UID = "22222222-2222-2222-2222-222222222222"
+
+
+class AmountRangeTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        file_cache.clear()
+        ensure_data_files_exist()
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        file_cache.clear()
+        self._tmp.cleanup()
+
+    def test_out_of_range_amount_is_value_error(self):
+        with self.assertRaisesRegex(ValueError, "^Tutar Geçersiz.$"):
+            bin_store.append_row(TRANSACTIONS_FILE, [TID, UID, "01-01-2024", "expense", "100000000000000000.00", "", ""])
+
+    def test_import_skips_out_of_range_rows(self):
+        TRANSACTIONS_FILE.write_text(
+            f"{TID}\t{UID}\t01-01-2024\texpense\t999999999999999999.00\t\tbüyük\n"
+            f"{UID}\t{UID}\t01-01-2024\texpense\t12.50\t\tnormal\n",
+            encoding="utf-8",
+        )
+        self.assertEqual(bin_store.import_tsv(), {"rows": 1, "skipped": 1})
+        self.assertEqual(bin_store.read_rows(TRANSACTIONS_FILE)[0][4:], ["12.50", "", "normal"])
+        self.assertEqual(sorted(p.name for p in TRANSACTIONS_FILE.parent.glob("*.tmp")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
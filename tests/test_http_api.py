@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from src.core.config import ensure_data_files_exist
+from src.services import auth_service, category_service
+from src.storage import file_cache
+from src.ui import http_api
+
+
+class PostTransactionFieldsTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        file_cache.clear()
+        ensure_data_files_exist()
+        user = auth_service.register("deneme", "sifre123", "sifre123")
+        self.headers = {"authorization": f"Bearer {auth_service.start_session(user)}"}
+        self.category_id = category_service.create_category(user["user_id"], "Market", "expense")["category_id"]
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        file_cache.clear()
+        self._tmp.cleanup()
+
+    def post(self, body):
+        return http_api.route("POST", "/transactions", {}, self.headers, body)
+
+    def test_non_string_date_is_validation_error(self):
+        with self.assertRaises(ValueError):
+            self.post({"type": "expense", "amount": 10, "date": 20240101, "category_id": self.category_id})
+
+    def test_non_string_category_is_validation_error(self):
+        with self.assertRaises(ValueError):
+            self.post({"type": "expense", "amount": 10, "date": "01-01-2024", "category_id": 5})
+
+    def test_missing_optional_fields_use_defaults(self):
+        status, tx = self.post({"type": "expense", "amount": 12.5, "category_id": self.category_id})
+        self.assertEqual(status, 201)
+        self.assertEqual(tx["amount_cents"], 1250)
+
+
+if __name__ == "__main__":
+    unittest.main()
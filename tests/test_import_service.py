@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.config import ensure_data_files_exist
+from src.services import import_service, transaction_service
+from src.storage import file_cache
+
+
+class ImportValidationTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        file_cache.clear()
+        ensure_data_files_exist()
+        self.uid = "u1"
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        file_cache.clear()
+        self._tmp.cleanup()
+
+    def run_import(self, text):
+        src = Path("ekstre.csv")
+        src.write_text(text, encoding="utf-8")
+        return import_service.import_transactions(self.uid, src)
+
+    def test_signed_amounts(self):
+        res = self.run_import("date,amount\n01-01-2024,-5\n02-01-2024,+7\n03-01-2024,--5\n04-01-2024,+-5\n05-01-2024,-+5\n")
+        self.assertEqual(res["imported"], 2)
+        self.assertEqual([line for line, _ in res["errors"]], [4, 5, 6])
+        types = sorted(t["type"] for t in transaction_service.list_transactions(self.uid))
+        self.assertEqual(types, ["expense", "income"])
+
+    def test_blank_date_is_row_error(self):
+        res = self.run_import("date,amount\n,-5\n01-01-2024,-5\n")
+        self.assertEqual(res["imported"], 1)
+        self.assertEqual(res["errors"], [(2, "Tarih boş olamaz.")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import unittest
+from unittest import mock
+
+from src.core import instrument
+
+
+class EnvSwitchTest(unittest.TestCase):
+    def check(self, value, enabled, output):
+        with mock.patch.dict(os.environ, {instrument.ENV_VAR: value}):
+            self.assertEqual(instrument.enabled(), enabled)
+            self.assertEqual(instrument.output_path(), output)
+
+    def test_off_values(self):
+        for v in ("", "0", "false", "No", "OFF", " 0 "):
+            with self.subTest(v=v):
+                self.check(v, False, None)
+
+    def test_on_values(self):
+        for v in ("1", "true", "Yes", "on"):
+            with self.subTest(v=v):
+                self.check(v, True, None)
+
+    def test_output_path(self):
+        self.check("stats.json", True, "stats.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
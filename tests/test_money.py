@@ -0,0 +1,30 @@
+import unittest
+
+from src.core.money import format_cents, parse_stored_cents, to_cents
+
+
+class ToCentsTest(unittest.TestCase):
+    def test_valid_inputs(self):
+        self.assertEqual(to_cents("12,5"), 1250)
+        self.assertEqual(to_cents("12.50"), 1250)
+        self.assertEqual(to_cents("1e3"), 100000)
+        self.assertEqual(to_cents("0.005"), 1)
+
+    def test_invalid_inputs(self):
+        for s in ("", "abc", "1,2,3", "nan", "NaN", "snan", "inf", "-Infinity"):
+            with self.subTest(s=s):
+                with self.assertRaisesRegex(ValueError, "^Tutar Geçersiz.$"):
+                    to_cents(s)
+
+
+class StoredCentsTest(unittest.TestCase):
+    def test_round_trip(self):
+        for cents in (0, 5, 1250, 1200000):
+            self.assertEqual(parse_stored_cents(format_cents(cents)), cents)
+
+    def test_malformed_is_zero(self):
+        self.assertEqual(parse_stored_cents("abc"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()